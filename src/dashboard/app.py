@@ -7,58 +7,435 @@ for analyzing electric product data.
 
 import pandas as pd
 import numpy as np
+import duckdb
 import os
-import plotly.express as px
+from functools import lru_cache
 import plotly.graph_objects as go
-from dash import Dash, html, dcc, callback, Output, Input
+from plotly.colors import qualitative
+from dash import Dash, html, dcc, callback, Output, Input, Patch
 import dash_bootstrap_components as dbc
 
+# plotly-resampler is optional; without it the trend figure is sent in full
+try:
+    from plotly_resampler import FigureResampler
+except ImportError:
+    FigureResampler = None
+
+# Numba is optional; without it the KPI kernel falls back to NumPy
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
 # Define paths
-DATA_DIR = "src/models/star_schema"
+DATA_DIR = "src/models/denormalized"
+
+# Performance metrics shown in the dashboard
+PERFORMANCE_METRICS = ['energy_consumption_kwh', 'failure_rate', 'customer_satisfaction', 'return_rate']
+
+# Traces with more points than this are rendered with WebGL
+WEBGL_POINT_THRESHOLD = 5000
+
+# Maximum number of trend points sent to the browser per viewport
+RESAMPLER_SHOWN_SAMPLES = 2000
+
+# The resampled trend figure is one server-side object shared by every
+# session, so concurrent users would overwrite each other's series; it is
+# only used when explicitly enabled for a single-user (local) dashboard
+RESAMPLE_TREND = os.environ.get("DASHBOARD_RESAMPLE_TREND") == "1"
+
+# Color for values missing from a color map (e.g. a null category)
+DEFAULT_COLOR = '#7f7f7f'
 
-def load_star_schema_data(data_dir):
-    """Load star schema data from CSV files."""
-    # Load dimension tables
-    dim_date = pd.read_csv(f"{data_dir}/dim_date.csv")
-    dim_product = pd.read_csv(f"{data_dir}/dim_product.csv")
-    dim_customer = pd.read_csv(f"{data_dir}/dim_customer.csv")
-    dim_store = pd.read_csv(f"{data_dir}/dim_store.csv")
-    
-    # Load fact tables
-    fact_sales = pd.read_csv(f"{data_dir}/fact_sales.csv")
-    fact_performance = pd.read_csv(f"{data_dir}/fact_performance.csv")
-    
-    print("Star schema data loaded successfully")
-    return dim_date, dim_product, dim_customer, dim_store, fact_sales, fact_performance
+# Columns of the denormalized tables used by the dashboard
+SALES_COLUMNS = ['year', 'month', 'category', 'country', 'total_amount', 'profit_margin']
+PERFORMANCE_COLUMNS = ['year', 'category', 'subcategory'] + PERFORMANCE_METRICS
 
-def prepare_dashboard_data(dim_date, dim_product, dim_customer, dim_store, fact_sales, fact_performance):
-    """Prepare data for dashboard visualizations by joining fact and dimension tables."""
-    # Join sales fact with dimensions
-    sales_data = fact_sales.merge(dim_date, on='date_key', how='left')
-    sales_data = sales_data.merge(dim_product, on='product_key', how='left')
-    sales_data = sales_data.merge(dim_customer, on='customer_key', how='left')
-    sales_data = sales_data.merge(dim_store, on='store_key', how='left')
-    
-    # Join performance fact with dimensions
-    performance_data = fact_performance.merge(dim_date, on='date_key', how='left')
-    performance_data = performance_data.merge(dim_product, on='product_key', how='left')
-    
-    # Convert date columns to datetime
-    sales_data['date'] = pd.to_datetime(sales_data['date'])
-    performance_data['date'] = pd.to_datetime(performance_data['date'])
-    
-    print("Dashboard data prepared successfully")
+# DuckDB performance cube: per year/category/subcategory sums and counts of
+# each metric, so filtered means can be re-derived exactly
+PERFORMANCE_CUBE_SQL = (
+    "CREATE TABLE performance_cube AS SELECT year, category, subcategory, " +
+    ", ".join(f"SUM({m}) AS {m}_sum, COUNT({m}) AS {m}_count" for m in PERFORMANCE_METRICS) +
+    " FROM performance_data GROUP BY year, category, subcategory"
+)
+PERFORMANCE_FILTER_SQL = (
+    "FROM performance_cube WHERE list_contains($categories, category) AND list_contains($years, year)"
+)
+SATISFACTION_SQL = (
+    "SELECT SUM(customer_satisfaction_sum) / NULLIF(SUM(customer_satisfaction_count), 0) " +
+    PERFORMANCE_FILTER_SQL
+)
+PERFORMANCE_METRICS_SQL = (
+    "SELECT category, " +
+    ", ".join(f"SUM({m}_sum) / SUM({m}_count) AS {m}" for m in PERFORMANCE_METRICS) +
+    f" {PERFORMANCE_FILTER_SQL} GROUP BY category ORDER BY category"
+)
+FAILURE_RATE_SQL = (
+    "SELECT category, subcategory, SUM(failure_rate_sum) / SUM(failure_rate_count) AS failure_rate "
+    f"{PERFORMANCE_FILTER_SQL} GROUP BY category, subcategory ORDER BY category, failure_rate DESC"
+)
+
+def load_dashboard_data(data_dir):
+    """Load denormalized dashboard tables from Parquet files."""
+    # Only read the columns the callbacks use
+    sales_data = pd.read_parquet(f"{data_dir}/sales_data.parquet", engine='pyarrow', columns=SALES_COLUMNS)
+    performance_data = pd.read_parquet(
+        f"{data_dir}/performance_data.parquet", engine='pyarrow', columns=PERFORMANCE_COLUMNS
+    )
+    
+    print("Dashboard data loaded successfully")
     return sales_data, performance_data
 
+def render_mode(df):
+    """Use the WebGL renderer for traces dense enough to slow down SVG."""
+    return 'webgl' if len(df) > WEBGL_POINT_THRESHOLD else 'svg'
+
+def filter_key(values):
+    """Return a canonical, hashable cache key for a dropdown selection."""
+    # Nulls (None, or NaN sent back as None) never select anything, so they
+    # are dropped rather than compared against the real values
+    return tuple(sorted(value for value in values or [] if value is not None and value == value))
+
+def color_map(values):
+    """Assign a stable qualitative color to each value."""
+    palette = qualitative.Plotly
+    return {value: palette[i % len(palette)] for i, value in enumerate(values)}
+
+def figure_layout(title, xaxis_title, yaxis_title, **kwargs):
+    """Create the layout shared by all dashboard figures."""
+    return go.Layout(
+        title=title, xaxis_title=xaxis_title, yaxis_title=yaxis_title,
+        template='plotly_white', **kwargs
+    )
+
+def sales_trend_figure(sales_by_month):
+    """Create the monthly sales trend line chart."""
+    trace = go.Scattergl if render_mode(sales_by_month) == 'webgl' else go.Scatter
+    return go.Figure(
+        trace(
+            x=sales_by_month['date'].to_numpy(), y=sales_by_month['total_amount'].to_numpy(),
+            mode='lines'
+        ),
+        layout=figure_layout('Monthly Sales Trend', 'Date', 'Total Sales ($)')
+    )
+
+def sales_bar_figure(sales, column, title, label, colors):
+    """Create a single-trace sales bar chart with one color per bar."""
+    # A single trace (rather than one per color) lets callbacks patch x/y in place
+    return go.Figure(
+        go.Bar(
+            x=sales[column].to_numpy(), y=sales['total_amount'].to_numpy(),
+            marker_color=[colors.get(value, DEFAULT_COLOR) for value in sales[column]]
+        ),
+        layout=figure_layout(title, label, 'Total Sales ($)')
+    )
+
+def performance_metrics_figure(performance_metrics):
+    """Create the grouped performance metrics bar chart (one trace per metric)."""
+    x = performance_metrics['category'].to_numpy()
+    return go.Figure(
+        [go.Bar(x=x, y=performance_metrics[metric].to_numpy(), name=metric) for metric in PERFORMANCE_METRICS],
+        layout=figure_layout(
+            'Average Performance Metrics by Category', 'Category', 'Value',
+            barmode='group', legend_title_text='Metric'
+        )
+    )
+
+def energy_satisfaction_figure(energy, satisfaction, return_rate, category, category_names, colors):
+    """Create the energy consumption vs. customer satisfaction scatter plot."""
+    # Marker area scales with return rate, largest marker 20px across
+    max_return_rate = return_rate.max() if len(return_rate) else 0
+    sizeref = 2 * max_return_rate / 20 ** 2 if max_return_rate > 0 else 1
+    
+    # One trace per category present, in category order
+    traces = []
+    for code in category_names.argsort():
+        rows = category == code
+        if not rows.any():
+            continue
+        name = category_names[code]
+        traces.append(go.Scattergl(
+            x=energy[rows], y=satisfaction[rows],
+            mode='markers', name=name,
+            marker=dict(size=return_rate[rows], sizemode='area', sizeref=sizeref, color=colors.get(name, DEFAULT_COLOR))
+        ))
+    # Closest-point hover search is the main cost on dense scatters
+    return go.Figure(traces, layout=figure_layout(
+        'Energy Consumption vs. Customer Satisfaction',
+        'Energy Consumption (kWh)', 'Customer Satisfaction (1-5)',
+        hovermode='x', legend_title_text='Category'
+    ))
+
+def failure_rate_figure(failure_rate, colors):
+    """Create the failure rate by subcategory bar chart."""
+    traces = [
+        go.Bar(
+            x=rows['subcategory'].to_numpy(), y=rows['failure_rate'].to_numpy(),
+            name=category, marker_color=colors.get(category, DEFAULT_COLOR)
+        )
+        for category, rows in failure_rate.groupby('category', observed=True, sort=False)
+    ]
+    return go.Figure(traces, layout=figure_layout(
+        'Average Failure Rate by Product Subcategory', 'Subcategory', 'Failure Rate',
+        barmode='relative', legend_title_text='Category'
+    ))
+
+def factorize_level(index, level):
+    """Factorize one or more index levels into integer codes and their unique values."""
+    values = index.get_level_values(level) if isinstance(level, str) else index.droplevel(
+        [name for name in index.names if name not in level]
+    )
+    # Keep missing values as their own code so they can still be selected
+    codes, uniques = pd.factorize(values, use_na_sentinel=False)
+    return codes, uniques.set_names(values.names)
+
+def selection_table(uniques, values):
+    """Return a per-code boolean lookup table of the selected values."""
+    # Map the selection to codes once; row masks are then a single take on
+    # the int code array instead of np.isin/hashing every row. Nulls are
+    # skipped like in filter_key, so a missing-year code is never selected
+    indexer = uniques.get_indexer([value for value in values if value is not None and value == value])
+    selected = np.zeros(len(uniques), dtype=bool)
+    selected[indexer[indexer >= 0]] = True
+    return selected
+
+def code_mask(codes, uniques, values):
+    """Return a boolean mask of rows whose code maps to one of the selected values."""
+    return selection_table(uniques, values)[codes]
+
+def sales_kpis_loop(category, country, year, period, amount, margin_sum, margin_count,
+                    category_selected, country_selected, year_selected,
+                    n_categories, n_countries, n_periods):
+    """Filter the sales cube and accumulate every KPI in a single pass."""
+    total = 0.0
+    margin_total = 0.0
+    margin_rows = 0
+    category_totals = np.zeros(n_categories)
+    category_rows = np.zeros(n_categories, dtype=np.int64)
+    country_totals = np.zeros(n_countries)
+    country_rows = np.zeros(n_countries, dtype=np.int64)
+    period_totals = np.zeros(n_periods)
+    period_rows = np.zeros(n_periods, dtype=np.int64)
+    for i in range(category.size):
+        if category_selected[category[i]] and country_selected[country[i]] and year_selected[year[i]]:
+            total += amount[i]
+            margin_total += margin_sum[i]
+            margin_rows += margin_count[i]
+            category_totals[category[i]] += amount[i]
+            category_rows[category[i]] += 1
+            country_totals[country[i]] += amount[i]
+            country_rows[country[i]] += 1
+            period_totals[period[i]] += amount[i]
+            period_rows[period[i]] += 1
+    return (total, margin_total, margin_rows, category_totals, category_rows,
+            country_totals, country_rows, period_totals, period_rows)
+
+def sales_kpis_numpy(category, country, year, period, amount, margin_sum, margin_count,
+                     category_selected, country_selected, year_selected,
+                     n_categories, n_countries, n_periods):
+    """Filter the sales cube and accumulate every KPI with NumPy (no Numba)."""
+    mask = category_selected[category] & country_selected[country] & year_selected[year]
+    amount = amount[mask]
+    return (
+        amount.sum(), margin_sum[mask].sum(), margin_count[mask].sum(),
+        np.bincount(category[mask], weights=amount, minlength=n_categories),
+        np.bincount(category[mask], minlength=n_categories),
+        np.bincount(country[mask], weights=amount, minlength=n_countries),
+        np.bincount(country[mask], minlength=n_countries),
+        np.bincount(period[mask], weights=amount, minlength=n_periods),
+        np.bincount(period[mask], minlength=n_periods)
+    )
+
+# Sequential JIT loop; the cube is small, and prange would race on the
+# per-group accumulators
+sales_kpis = njit(cache=True)(sales_kpis_loop) if njit is not None else sales_kpis_numpy
+
+def group_frame(uniques, totals, rows):
+    """Build a total_amount frame for the groups that have at least one row."""
+    present = rows > 0
+    grouped = uniques[present].to_frame(index=False)
+    grouped['total_amount'] = totals[present]
+    return grouped
+
 def create_app(sales_data, performance_data):
     """Create Dash application with interactive visualizations."""
     # Initialize Dash app
     app = Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP])
     
-    # Get unique categories and countries for filters
-    categories = sorted(sales_data['category'].unique())
-    countries = sorted(sales_data['country_y'].unique())
-    years = sorted(sales_data['year'].unique())
+    # Get unique categories and countries for filters; the categorical
+    # columns already hold their sorted values, so no scan is needed
+    categories = list(sales_data['category'].cat.categories)
+    countries = list(sales_data['country'].cat.categories)
+    # Sales dated outside dim_date have no year; they are not offered as
+    # an option (Dash would send a NaN option back as None)
+    years = sorted(sales_data['year'].dropna().unique())
+    
+    # Keep bar colors stable across filter changes; the category map also
+    # covers categories that only appear in the performance data
+    category_colors = color_map(categories + [
+        c for c in performance_data['category'].cat.categories if c not in categories
+    ])
+    country_colors = color_map(countries)
+    
+    # Pre-aggregate the fact data once so callbacks only slice small frames.
+    # Sums and counts are kept (rather than means) so filtered subsets can be
+    # re-aggregated exactly.
+    sales_agg = sales_data.groupby(
+        ['year', 'month', 'category', 'country'], observed=True, dropna=False
+    )[['total_amount', 'profit_margin']].agg(['sum', 'count']).sort_index()
+    
+    # The performance cube lives in DuckDB (which sums floats in double
+    # precision); its summaries are vectorized SQL queries over it
+    con = duckdb.connect()
+    con.register('performance_data', performance_data)
+    con.execute(PERFORMANCE_CUBE_SQL)
+    con.unregister('performance_data')
+    
+    # Flatten the sales cube into integer code arrays so callbacks can
+    # filter and aggregate them in one compiled pass instead of slicing and
+    # grouping DataFrames
+    cube_index = sales_agg.index
+    cube_category, cube_categories = factorize_level(cube_index, 'category')
+    cube_country, cube_countries = factorize_level(cube_index, 'country')
+    cube_year, cube_years = factorize_level(cube_index, 'year')
+    cube_period, cube_periods = factorize_level(cube_index, ['year', 'month'])
+    cube_amount = sales_agg[('total_amount', 'sum')].to_numpy()
+    cube_margin_sum = sales_agg[('profit_margin', 'sum')].to_numpy()
+    cube_margin_count = sales_agg[('profit_margin', 'count')].to_numpy()
+    
+    # Same code arrays for the raw scatter rows, with the plotted columns as
+    # plain arrays aligned to them, so the scatter callback never touches
+    # the performance DataFrame
+    scatter_index = pd.MultiIndex.from_frame(performance_data[['year', 'category']])
+    scatter_category, scatter_categories = factorize_level(scatter_index, 'category')
+    scatter_year, scatter_years = factorize_level(scatter_index, 'year')
+    scatter_energy = performance_data['energy_consumption_kwh'].to_numpy()
+    scatter_satisfaction = performance_data['customer_satisfaction'].to_numpy()
+    scatter_return_rate = performance_data['return_rate'].to_numpy()
+    
+    # Cache aggregated results per filter combination (keys come from
+    # filter_key) so repeat selections skip the aggregation entirely
+    @lru_cache(maxsize=128)
+    def sales_summary(categories_key, countries_key, years_key):
+        # Filter the cube and sum by category, country and month in one pass
+        (total, margin_total, margin_rows, category_totals, category_rows,
+         country_totals, country_rows, period_totals, period_rows) = sales_kpis(
+            cube_category, cube_country, cube_year, cube_period,
+            cube_amount, cube_margin_sum, cube_margin_count,
+            selection_table(cube_categories, categories_key),
+            selection_table(cube_countries, countries_key),
+            selection_table(cube_years, years_key),
+            len(cube_categories), len(cube_countries), len(cube_periods)
+        )
+        
+        # Calculate key metrics
+        total_sales = f"${total:,.2f}"
+        
+        avg_profit_margin = margin_total / margin_rows if margin_rows else np.nan
+        avg_profit_margin = f"{avg_profit_margin:.1f}%" if not pd.isna(avg_profit_margin) else "N/A"
+        
+        # Monthly sales trend
+        sales_by_month = group_frame(cube_periods, period_totals, period_rows).dropna()
+        # Assemble dates from the numeric year/month columns (no string round trip)
+        sales_by_month['date'] = pd.to_datetime(sales_by_month[['year', 'month']].assign(day=1))
+        sales_by_month = sales_by_month.sort_values('date')
+        
+        # Sales by category and by country
+        category_sales = group_frame(cube_categories, category_totals, category_rows).sort_values(
+            'total_amount', ascending=False
+        )
+        country_sales = group_frame(cube_countries, country_totals, country_rows).sort_values(
+            'total_amount', ascending=False
+        )
+        
+        return {
+            'total_sales': total_sales,
+            'avg_profit_margin': avg_profit_margin,
+            'sales_by_month': sales_by_month,
+            'category_sales': category_sales,
+            'country_sales': country_sales
+        }
+    
+    @lru_cache(maxsize=128)
+    def performance_summary(categories_key, years_key):
+        # Each call gets its own cursor, since Dash may run callbacks on
+        # several threads
+        cursor = con.cursor()
+        params = {'categories': list(categories_key), 'years': list(years_key)}
+        
+        # Calculate key metrics
+        avg_satisfaction = cursor.execute(SATISFACTION_SQL, params).fetchone()[0]
+        avg_satisfaction = f"{avg_satisfaction:.1f}/5.0" if not pd.isna(avg_satisfaction) else "N/A"
+        
+        # Performance metrics by category (means re-derived from sums and counts)
+        performance_metrics = cursor.execute(PERFORMANCE_METRICS_SQL, params).df()
+        
+        # Failure rate by subcategory
+        failure_rate = cursor.execute(FAILURE_RATE_SQL, params).df()
+        cursor.close()
+        
+        return {
+            'avg_satisfaction': avg_satisfaction,
+            'performance_metrics': performance_metrics,
+            'failure_rate': failure_rate
+        }
+    
+    # Multi-trace figures are rebuilt rather than patched; cache them in
+    # their serialized (dict) form
+    @lru_cache(maxsize=128)
+    def energy_satisfaction_json(categories_key, years_key):
+        # Raw performance rows are only needed for the scatter plot
+        mask = (
+            code_mask(scatter_category, scatter_categories, categories_key) &
+            code_mask(scatter_year, scatter_years, years_key)
+        )
+        return energy_satisfaction_figure(
+            scatter_energy[mask], scatter_satisfaction[mask], scatter_return_rate[mask],
+            scatter_category[mask], scatter_categories, category_colors
+        ).to_plotly_json()
+    
+    @lru_cache(maxsize=128)
+    def failure_rate_json(categories_key, years_key):
+        failure_rate = performance_summary(categories_key, years_key)['failure_rate']
+        return failure_rate_figure(failure_rate, category_colors).to_plotly_json()
+    
+    # Build the unfiltered figures for the initial layout; callbacks patch
+    # the single-trace charts in place afterwards
+    all_keys = (filter_key(categories), filter_key(countries), filter_key(years))
+    all_sales = sales_summary(*all_keys)
+    all_performance = performance_summary(all_keys[0], all_keys[2])
+    
+    sales_trend_fig = sales_trend_figure(all_sales['sales_by_month'])
+    category_sales_fig = sales_bar_figure(
+        all_sales['category_sales'], 'category', 'Sales by Product Category', 'Category', category_colors
+    )
+    country_sales_fig = sales_bar_figure(
+        all_sales['country_sales'], 'country', 'Sales by Country', 'Country', country_colors
+    )
+    performance_metrics_fig = performance_metrics_figure(all_performance['performance_metrics'])
+    
+    # With plotly-resampler installed and resampling enabled, a single
+    # resampled figure backs the trend chart: zooming re-downsamples the
+    # visible range server-side and filter changes replace its
+    # high-frequency data. Otherwise the plain figure is sent in full
+    trend_resampler = None
+    if FigureResampler is not None and RESAMPLE_TREND:
+        trend_resampler = FigureResampler(sales_trend_fig, default_n_shown_samples=RESAMPLER_SHOWN_SAMPLES)
+        trend_resampler.register_update_graph_callback(app, "sales-trend-chart")
+        sales_trend_fig = trend_resampler
+    energy_satisfaction_fig = energy_satisfaction_json(all_keys[0], all_keys[2])
+    failure_rate_fig = failure_rate_json(all_keys[0], all_keys[2])
+    
+    # Selections covering every option (initial load, reset filters)
+    # short-circuit to the unfiltered results above, which never fall out
+    # of the LRU caches
+    def selected_sales(selected_categories, selected_countries, selected_years):
+        keys = (filter_key(selected_categories), filter_key(selected_countries), filter_key(selected_years))
+        return all_sales if keys == all_keys else sales_summary(*keys)
+    
+    def selected_performance(selected_categories, selected_years):
+        keys = (filter_key(selected_categories), filter_key(selected_years))
+        return all_performance if keys == (all_keys[0], all_keys[2]) else performance_summary(*keys)
     
     # Create app layout
     app.layout = dbc.Container([
@@ -103,56 +480,56 @@ def create_app(sales_data, performance_data):
                     dbc.Col(dbc.Card([
                         dbc.CardBody([
                             html.H5("Total Sales", className="card-title"),
-                            html.H3(id="total-sales", className="text-center text-success")
+                            html.H3(all_sales['total_sales'], id="total-sales", className="text-center text-success")
                         ])
                     ]), width=4),
                     dbc.Col(dbc.Card([
                         dbc.CardBody([
                             html.H5("Avg. Customer Satisfaction", className="card-title"),
-                            html.H3(id="avg-satisfaction", className="text-center text-info")
+                            html.H3(all_performance['avg_satisfaction'], id="avg-satisfaction", className="text-center text-info")
                         ])
                     ]), width=4),
                     dbc.Col(dbc.Card([
                         dbc.CardBody([
                             html.H5("Profit Margin", className="card-title"),
-                            html.H3(id="avg-profit-margin", className="text-center text-warning")
+                            html.H3(all_sales['avg_profit_margin'], id="avg-profit-margin", className="text-center text-warning")
                         ])
                     ]), width=4)
                 ]),
                 
                 html.H4("Sales Trends", className="text-primary mt-4"),
-                dcc.Graph(id="sales-trend-chart")
+                dcc.Graph(id="sales-trend-chart", figure=sales_trend_fig)
             ], width=9)
         ]),
         
         dbc.Row([
             dbc.Col([
                 html.H4("Sales by Category", className="text-primary"),
-                dcc.Graph(id="category-sales-chart")
+                dcc.Graph(id="category-sales-chart", figure=category_sales_fig)
             ], width=6),
             
             dbc.Col([
                 html.H4("Sales by Country", className="text-primary"),
-                dcc.Graph(id="country-sales-chart")
+                dcc.Graph(id="country-sales-chart", figure=country_sales_fig)
             ], width=6)
         ]),
         
         dbc.Row([
             dbc.Col([
                 html.H4("Product Performance Metrics", className="text-primary"),
-                dcc.Graph(id="performance-metrics-chart")
+                dcc.Graph(id="performance-metrics-chart", figure=performance_metrics_fig)
             ], width=12)
         ]),
         
         dbc.Row([
             dbc.Col([
                 html.H4("Energy Consumption vs. Customer Satisfaction", className="text-primary"),
-                dcc.Graph(id="energy-satisfaction-chart")
+                dcc.Graph(id="energy-satisfaction-chart", figure=energy_satisfaction_fig)
             ], width=6),
             
             dbc.Col([
                 html.H4("Failure Rate by Product Category", className="text-primary"),
-                dcc.Graph(id="failure-rate-chart")
+                dcc.Graph(id="failure-rate-chart", figure=failure_rate_fig)
             ], width=6)
         ]),
         
@@ -162,127 +539,89 @@ def create_app(sales_data, performance_data):
         ])
     ], fluid=True)
     
-    # Define callbacks for interactive elements
+    # Define callbacks for interactive elements. Each output has its own
+    # callback and only listens to the filters it depends on, so e.g. a
+    # country change leaves the performance charts untouched. The layout
+    # already holds the unfiltered outputs, so none run on page load.
+    sales_inputs = [Input("category-filter", "value"),
+                    Input("country-filter", "value"),
+                    Input("year-filter", "value")]
+    performance_inputs = [Input("category-filter", "value"),
+                          Input("year-filter", "value")]
+    
     @app.callback(
         [Output("total-sales", "children"),
-         Output("avg-satisfaction", "children"),
-         Output("avg-profit-margin", "children"),
-         Output("sales-trend-chart", "figure"),
-         Output("category-sales-chart", "figure"),
-         Output("country-sales-chart", "figure"),
-         Output("performance-metrics-chart", "figure"),
-         Output("energy-satisfaction-chart", "figure"),
-         Output("failure-rate-chart", "figure")],
-        [Input("category-filter", "value"),
-         Input("country-filter", "value"),
-         Input("year-filter", "value")]
+         Output("avg-profit-margin", "children")],
+        sales_inputs,
+        prevent_initial_call=True
     )
-    def update_dashboard(selected_categories, selected_countries, selected_years):
-        # Filter data based on selections
-        filtered_sales = sales_data[
-            (sales_data['category'].isin(selected_categories)) &
-            (sales_data['country_y'].isin(selected_countries)) &
-            (sales_data['year'].isin(selected_years))
-        ]
-        
-        filtered_performance = performance_data[
-            (performance_data['category'].isin(selected_categories)) &
-            (performance_data['year'].isin(selected_years))
-        ]
-        
-        # Calculate key metrics
-        total_sales = f"${filtered_sales['total_amount'].sum():,.2f}"
-        
-        avg_satisfaction = filtered_performance['customer_satisfaction'].mean()
-        avg_satisfaction = f"{avg_satisfaction:.1f}/5.0" if not pd.isna(avg_satisfaction) else "N/A"
-        
-        avg_profit_margin = filtered_sales['profit_margin'].mean()
-        avg_profit_margin = f"{avg_profit_margin:.1f}%" if not pd.isna(avg_profit_margin) else "N/A"
-        
-        # Create sales trend chart
-        sales_by_month = filtered_sales.groupby(['year', 'month'])['total_amount'].sum().reset_index()
-        sales_by_month['date'] = pd.to_datetime(sales_by_month['year'].astype(str) + '-' + 
-                                               sales_by_month['month'].astype(str) + '-01')
-        sales_by_month = sales_by_month.sort_values('date')
-        
-        sales_trend_fig = px.line(
-            sales_by_month, x='date', y='total_amount',
-            title='Monthly Sales Trend',
-            labels={'total_amount': 'Total Sales ($)', 'date': 'Date'},
-            template='plotly_white'
-        )
-        
-        # Create category sales chart
-        category_sales = filtered_sales.groupby('category')['total_amount'].sum().reset_index()
-        category_sales = category_sales.sort_values('total_amount', ascending=False)
-        
-        category_sales_fig = px.bar(
-            category_sales, x='category', y='total_amount',
-            title='Sales by Product Category',
-            labels={'total_amount': 'Total Sales ($)', 'category': 'Category'},
-            template='plotly_white',
-            color='category'
-        )
-        
-        # Create country sales chart
-        country_sales = filtered_sales.groupby('country_y')['total_amount'].sum().reset_index()
-        country_sales = country_sales.sort_values('total_amount', ascending=False)
-        
-        country_sales_fig = px.bar(
-            country_sales, x='country_y', y='total_amount',
-            title='Sales by Country',
-            labels={'total_amount': 'Total Sales ($)', 'country_y': 'Country'},
-            template='plotly_white',
-            color='country_y'
-        )
-        
-        # Create performance metrics chart
-        performance_metrics = filtered_performance.groupby('category').agg({
-            'energy_consumption_kwh': 'mean',
-            'failure_rate': 'mean',
-            'customer_satisfaction': 'mean',
-            'return_rate': 'mean'
-        }).reset_index()
+    def update_sales_metrics(selected_categories, selected_countries, selected_years):
+        summary = selected_sales(selected_categories, selected_countries, selected_years)
+        return summary['total_sales'], summary['avg_profit_margin']
+    
+    @app.callback(Output("avg-satisfaction", "children"), performance_inputs, prevent_initial_call=True)
+    def update_satisfaction_metric(selected_categories, selected_years):
+        return selected_performance(selected_categories, selected_years)['avg_satisfaction']
+    
+    # The resampler's zoom callback also writes the trend figure, so this
+    # output is marked as a duplicate
+    @app.callback(
+        Output("sales-trend-chart", "figure", allow_duplicate=trend_resampler is not None),
+        sales_inputs,
+        prevent_initial_call=True
+    )
+    def update_sales_trend(selected_categories, selected_countries, selected_years):
+        sales_by_month = selected_sales(selected_categories, selected_countries, selected_years)['sales_by_month']
         
-        performance_metrics_fig = px.bar(
-            performance_metrics, x='category', 
-            y=['energy_consumption_kwh', 'failure_rate', 'customer_satisfaction', 'return_rate'],
-            title='Average Performance Metrics by Category',
-            labels={'value': 'Value', 'category': 'Category', 'variable': 'Metric'},
-            template='plotly_white',
-            barmode='group'
-        )
+        if trend_resampler is not None:
+            trend_resampler.replace(sales_trend_figure(sales_by_month))
+            return trend_resampler
         
-        # Create energy consumption vs. satisfaction chart
-        energy_satisfaction_fig = px.scatter(
-            filtered_performance, x='energy_consumption_kwh', y='customer_satisfaction',
-            color='category', size='return_rate',
-            title='Energy Consumption vs. Customer Satisfaction',
-            labels={
-                'energy_consumption_kwh': 'Energy Consumption (kWh)',
-                'customer_satisfaction': 'Customer Satisfaction (1-5)',
-                'category': 'Category',
-                'return_rate': 'Return Rate'
-            },
-            template='plotly_white'
-        )
+        patched = Patch()
+        patched['data'][0]['x'] = sales_by_month['date']
+        patched['data'][0]['y'] = sales_by_month['total_amount']
+        return patched
+    
+    @app.callback(Output("category-sales-chart", "figure"), sales_inputs, prevent_initial_call=True)
+    def update_category_sales(selected_categories, selected_countries, selected_years):
+        category_sales = selected_sales(selected_categories, selected_countries, selected_years)['category_sales']
         
-        # Create failure rate chart
-        failure_rate = filtered_performance.groupby(['category', 'subcategory'])['failure_rate'].mean().reset_index()
-        failure_rate = failure_rate.sort_values(['category', 'failure_rate'], ascending=[True, False])
+        patched = Patch()
+        patched['data'][0]['x'] = category_sales['category']
+        patched['data'][0]['y'] = category_sales['total_amount']
+        patched['data'][0]['marker']['color'] = [category_colors.get(c, DEFAULT_COLOR) for c in category_sales['category']]
+        return patched
+    
+    @app.callback(Output("country-sales-chart", "figure"), sales_inputs, prevent_initial_call=True)
+    def update_country_sales(selected_categories, selected_countries, selected_years):
+        country_sales = selected_sales(selected_categories, selected_countries, selected_years)['country_sales']
         
-        failure_rate_fig = px.bar(
-            failure_rate, x='subcategory', y='failure_rate', color='category',
-            title='Average Failure Rate by Product Subcategory',
-            labels={'failure_rate': 'Failure Rate', 'subcategory': 'Subcategory', 'category': 'Category'},
-            template='plotly_white'
-        )
+        patched = Patch()
+        patched['data'][0]['x'] = country_sales['country']
+        patched['data'][0]['y'] = country_sales['total_amount']
+        patched['data'][0]['marker']['color'] = [country_colors.get(c, DEFAULT_COLOR) for c in country_sales['country']]
+        return patched
+    
+    @app.callback(Output("performance-metrics-chart", "figure"), performance_inputs, prevent_initial_call=True)
+    def update_performance_metrics(selected_categories, selected_years):
+        performance_metrics = selected_performance(selected_categories, selected_years)['performance_metrics']
         
-        return (
-            total_sales, avg_satisfaction, avg_profit_margin,
-            sales_trend_fig, category_sales_fig, country_sales_fig,
-            performance_metrics_fig, energy_satisfaction_fig, failure_rate_fig
-        )
+        # One trace per metric, in PERFORMANCE_METRICS order
+        patched = Patch()
+        for i, metric in enumerate(PERFORMANCE_METRICS):
+            patched['data'][i]['x'] = performance_metrics['category']
+            patched['data'][i]['y'] = performance_metrics[metric]
+        return patched
+    
+    @app.callback(Output("energy-satisfaction-chart", "figure"), performance_inputs, prevent_initial_call=True)
+    def update_energy_satisfaction(selected_categories, selected_years):
+        keys = (filter_key(selected_categories), filter_key(selected_years))
+        return energy_satisfaction_fig if keys == (all_keys[0], all_keys[2]) else energy_satisfaction_json(*keys)
+    
+    @app.callback(Output("failure-rate-chart", "figure"), performance_inputs, prevent_initial_call=True)
+    def update_failure_rate(selected_categories, selected_years):
+        keys = (filter_key(selected_categories), filter_key(selected_years))
+        return failure_rate_fig if keys == (all_keys[0], all_keys[2]) else failure_rate_json(*keys)
     
     return app
 
@@ -290,13 +629,8 @@ def main():
     """Main function to create and run the dashboard."""
     print("Starting Electric Product Data Analysis Dashboard...")
     
-    # Load star schema data
-    dim_date, dim_product, dim_customer, dim_store, fact_sales, fact_performance = load_star_schema_data(DATA_DIR)
-    
-    # Prepare data for dashboard
-    sales_data, performance_data = prepare_dashboard_data(
-        dim_date, dim_product, dim_customer, dim_store, fact_sales, fact_performance
-    )
+    # Load denormalized dashboard data (built by src/models/build_denormalized.py)
+    sales_data, performance_data = load_dashboard_data(DATA_DIR)
     
     # Create Dash app
     app = create_app(sales_data, performance_data)
@@ -8,12 +8,10 @@ performance metrics, and customer information.
 import pandas as pd
 import numpy as np
 import os
-from datetime import datetime, timedelta
-import random
+from datetime import datetime
 
-# Set random seed for reproducibility
-np.random.seed(42)
-random.seed(42)
+# Set random seed for reproducibility; all tables are drawn from one generator
+rng = np.random.default_rng(42)
 
 # Define constants
 NUM_PRODUCTS = 100
@@ -37,33 +35,39 @@ def generate_product_data():
         'Renewable Energy': ['Solar Panels', 'Wind Turbines', 'Batteries', 'Inverters', 'Chargers']
     }
     
-    products = []
-    for i in range(1, NUM_PRODUCTS + 1):
-        product_id = f'P{i:04d}'
-        category = random.choice(categories)
-        subcategory = random.choice(subcategories[category])
-        energy_rating = random.choice(['A+++', 'A++', 'A+', 'A', 'B', 'C'])
-        price = round(random.uniform(10, 2000), 2)
-        manufacturing_cost = round(price * random.uniform(0.4, 0.7), 2)
-        warranty_years = random.choice([1, 2, 3, 5])
-        weight_kg = round(random.uniform(0.1, 100), 2)
-        stock_quantity = random.randint(0, 1000)
-        
-        products.append({
-            'product_id': product_id,
-            'product_name': f'{subcategory} {random.choice(["Pro", "Max", "Ultra", "Eco", "Basic"])} {random.randint(100, 999)}',
-            'category': category,
-            'subcategory': subcategory,
-            'energy_rating': energy_rating,
-            'price': price,
-            'manufacturing_cost': manufacturing_cost,
-            'warranty_years': warranty_years,
-            'weight_kg': weight_kg,
-            'stock_quantity': stock_quantity,
-            'launch_date': (START_DATE + timedelta(days=random.randint(0, 365))).strftime('%Y-%m-%d')
-        })
-    
-    df_products = pd.DataFrame(products)
+    # Pick a category per product, then a subcategory within it from a flat
+    # subcategory array indexed by per-category offsets
+    category_idx = rng.integers(0, len(categories), size=NUM_PRODUCTS)
+    subcategory_counts = np.array([len(subcategories[c]) for c in categories])
+    subcategory_offsets = np.concatenate([[0], np.cumsum(subcategory_counts)[:-1]])
+    flat_subcategories = np.array([sub for c in categories for sub in subcategories[c]])
+    subcategory = flat_subcategories[
+        subcategory_offsets[category_idx] + rng.integers(0, subcategory_counts[category_idx])
+    ]
+    
+    # Draw every numeric attribute as one array
+    price = np.round(rng.uniform(10, 2000, size=NUM_PRODUCTS), 2)
+    manufacturing_cost = np.round(price * rng.uniform(0.4, 0.7, size=NUM_PRODUCTS), 2)
+    launch_dates = pd.Timestamp(START_DATE) + pd.to_timedelta(rng.integers(0, 366, size=NUM_PRODUCTS), unit='D')
+    product_name = (
+        pd.Series(subcategory) + ' ' +
+        rng.choice(["Pro", "Max", "Ultra", "Eco", "Basic"], size=NUM_PRODUCTS) + ' ' +
+        rng.integers(100, 1000, size=NUM_PRODUCTS).astype(str)
+    )
+    
+    df_products = pd.DataFrame({
+        'product_id': ('P' + pd.Series(np.arange(1, NUM_PRODUCTS + 1)).astype(str).str.zfill(4)).to_numpy(),
+        'product_name': product_name.to_numpy(),
+        'category': np.array(categories)[category_idx],
+        'subcategory': subcategory,
+        'energy_rating': rng.choice(['A+++', 'A++', 'A+', 'A', 'B', 'C'], size=NUM_PRODUCTS),
+        'price': price,
+        'manufacturing_cost': manufacturing_cost,
+        'warranty_years': rng.choice([1, 2, 3, 5], size=NUM_PRODUCTS),
+        'weight_kg': np.round(rng.uniform(0.1, 100, size=NUM_PRODUCTS), 2),
+        'stock_quantity': rng.integers(0, 1001, size=NUM_PRODUCTS),
+        'launch_date': launch_dates.strftime('%Y-%m-%d')
+    })
     df_products.to_csv('sample_data/products.csv', index=False)
     print(f"Generated {len(df_products)} product records")
     return df_products
@@ -73,23 +77,19 @@ def generate_customer_data():
     countries = ['USA', 'Canada', 'UK', 'Germany', 'France', 'Australia', 'Japan', 'China', 'India', 'Brazil']
     segments = ['Residential', 'Commercial', 'Industrial']
     
-    customers = []
-    for i in range(1, NUM_CUSTOMERS + 1):
-        customer_id = f'C{i:04d}'
-        country = random.choice(countries)
-        segment = random.choice(segments)
-        acquisition_date = START_DATE + timedelta(days=random.randint(0, 730))
-        
-        customers.append({
-            'customer_id': customer_id,
-            'customer_name': f'Customer {i}',
-            'country': country,
-            'segment': segment,
-            'acquisition_date': acquisition_date.strftime('%Y-%m-%d'),
-            'lifetime_value': round(random.uniform(100, 50000), 2)
-        })
-    
-    df_customers = pd.DataFrame(customers)
+    customer_numbers = pd.Series(np.arange(1, NUM_CUSTOMERS + 1)).astype(str)
+    acquisition_dates = pd.Timestamp(START_DATE) + pd.to_timedelta(
+        rng.integers(0, 731, size=NUM_CUSTOMERS), unit='D'
+    )
+    
+    df_customers = pd.DataFrame({
+        'customer_id': ('C' + customer_numbers.str.zfill(4)).to_numpy(),
+        'customer_name': ('Customer ' + customer_numbers).to_numpy(),
+        'country': rng.choice(countries, size=NUM_CUSTOMERS),
+        'segment': rng.choice(segments, size=NUM_CUSTOMERS),
+        'acquisition_date': acquisition_dates.strftime('%Y-%m-%d'),
+        'lifetime_value': np.round(rng.uniform(100, 50000, size=NUM_CUSTOMERS), 2)
+    })
     df_customers.to_csv('sample_data/customers.csv', index=False)
     print(f"Generated {len(df_customers)} customer records")
     return df_customers
@@ -99,23 +99,22 @@ def generate_store_data():
     countries = ['USA', 'Canada', 'UK', 'Germany', 'France', 'Australia', 'Japan', 'China', 'India', 'Brazil']
     store_types = ['Flagship', 'Mall', 'Street', 'Online']
     
-    stores = []
-    for i in range(1, NUM_STORES + 1):
-        store_id = f'S{i:03d}'
-        country = random.choice(countries)
-        store_type = random.choice(store_types)
-        opening_date = START_DATE + timedelta(days=random.randint(-365, 365))
-        
-        stores.append({
-            'store_id': store_id,
-            'store_name': f'{country} {store_type} Store {i}',
-            'country': country,
-            'store_type': store_type,
-            'opening_date': opening_date.strftime('%Y-%m-%d'),
-            'size_sqm': random.randint(50, 2000) if store_type != 'Online' else 0
-        })
-    
-    df_stores = pd.DataFrame(stores)
+    store_numbers = pd.Series(np.arange(1, NUM_STORES + 1)).astype(str)
+    country = pd.Series(rng.choice(countries, size=NUM_STORES))
+    store_type = pd.Series(rng.choice(store_types, size=NUM_STORES))
+    opening_dates = pd.Timestamp(START_DATE) + pd.to_timedelta(
+        rng.integers(-365, 366, size=NUM_STORES), unit='D'
+    )
+    
+    df_stores = pd.DataFrame({
+        'store_id': ('S' + store_numbers.str.zfill(3)).to_numpy(),
+        'store_name': (country + ' ' + store_type + ' Store ' + store_numbers).to_numpy(),
+        'country': country.to_numpy(),
+        'store_type': store_type.to_numpy(),
+        'opening_date': opening_dates.strftime('%Y-%m-%d'),
+        # Online stores have no floor space
+        'size_sqm': np.where(store_type != 'Online', rng.integers(50, 2001, size=NUM_STORES), 0)
+    })
     df_stores.to_csv('sample_data/stores.csv', index=False)
     print(f"Generated {len(df_stores)} store records")
     return df_stores
@@ -124,70 +123,66 @@ def generate_sales_data(products, customers, stores):
     """Generate sample sales transaction data."""
     payment_methods = ['Credit Card', 'Debit Card', 'Cash', 'Bank Transfer', 'Mobile Payment']
     
-    sales = []
-    for i in range(1, NUM_TRANSACTIONS + 1):
-        transaction_id = f'T{i:06d}'
-        transaction_date = START_DATE + timedelta(days=random.randint(0, 730))
-        customer_id = random.choice(customers['customer_id'])
-        store_id = random.choice(stores['store_id'])
-        
-        # Each transaction can have multiple products
-        num_products_in_transaction = random.randint(1, 5)
-        transaction_products = random.sample(list(products['product_id']), num_products_in_transaction)
-        
-        for product_id in transaction_products:
-            product_price = float(products.loc[products['product_id'] == product_id, 'price'].values[0])
-            quantity = random.randint(1, 5)
-            discount = round(random.uniform(0, 0.3), 2)
-            final_price = round(product_price * (1 - discount), 2)
-            
-            sales.append({
-                'transaction_id': transaction_id,
-                'product_id': product_id,
-                'customer_id': customer_id,
-                'store_id': store_id,
-                'transaction_date': transaction_date.strftime('%Y-%m-%d'),
-                'quantity': quantity,
-                'unit_price': product_price,
-                'discount': discount,
-                'final_price': final_price,
-                'total_amount': round(final_price * quantity, 2),
-                'payment_method': random.choice(payment_methods)
-            })
-    
-    df_sales = pd.DataFrame(sales)
+    # Draw transaction-level attributes for all transactions at once
+    transaction_days = rng.integers(0, 731, size=NUM_TRANSACTIONS)
+    transaction_customers = rng.choice(customers['customer_id'].to_numpy(), size=NUM_TRANSACTIONS)
+    transaction_stores = rng.choice(stores['store_id'].to_numpy(), size=NUM_TRANSACTIONS)
+    
+    # Each transaction can have multiple products; expand to one row per line item
+    num_products_in_transaction = rng.integers(1, 6, size=NUM_TRANSACTIONS)
+    transaction_idx = np.repeat(np.arange(NUM_TRANSACTIONS), num_products_in_transaction)
+    total_rows = len(transaction_idx)
+    
+    # Pick products by index, redrawing any product repeated within a transaction
+    product_idx = rng.integers(0, len(products), size=total_rows)
+    while True:
+        duplicated = pd.DataFrame({'t': transaction_idx, 'p': product_idx}).duplicated().to_numpy()
+        if not duplicated.any():
+            break
+        product_idx[duplicated] = rng.integers(0, len(products), size=duplicated.sum())
+    
+    # Look up prices by position instead of scanning the product table per row
+    product_price = products['price'].to_numpy()[product_idx]
+    quantity = rng.integers(1, 6, size=total_rows)
+    discount = np.round(rng.uniform(0, 0.3, size=total_rows), 2)
+    final_price = np.round(product_price * (1 - discount), 2)
+    
+    transaction_dates = pd.Timestamp(START_DATE) + pd.to_timedelta(transaction_days, unit='D')
+    
+    df_sales = pd.DataFrame({
+        'transaction_id': ('T' + pd.Series(transaction_idx + 1).astype(str).str.zfill(6)).to_numpy(),
+        'product_id': products['product_id'].to_numpy()[product_idx],
+        'customer_id': transaction_customers[transaction_idx],
+        'store_id': transaction_stores[transaction_idx],
+        'transaction_date': transaction_dates.strftime('%Y-%m-%d').to_numpy()[transaction_idx],
+        'quantity': quantity,
+        'unit_price': product_price,
+        'discount': discount,
+        'final_price': final_price,
+        'total_amount': np.round(final_price * quantity, 2),
+        'payment_method': rng.choice(payment_methods, size=total_rows)
+    })
     df_sales.to_csv('sample_data/sales.csv', index=False)
     print(f"Generated {len(df_sales)} sales records")
     return df_sales
 
 def generate_product_performance_data(products):
     """Generate sample product performance metrics."""
-    performance = []
-    for _, product in products.iterrows():
-        product_id = product['product_id']
-        
-        # Generate monthly performance data
-        current_date = START_DATE
-        while current_date <= END_DATE:
-            year_month = current_date.strftime('%Y-%m')
-            
-            performance.append({
-                'product_id': product_id,
-                'year_month': year_month,
-                'energy_consumption_kwh': round(random.uniform(10, 500), 2),
-                'failure_rate': round(random.uniform(0, 0.05), 4),
-                'customer_satisfaction': round(random.uniform(3, 5), 1),
-                'return_rate': round(random.uniform(0, 0.1), 4),
-                'warranty_claims': random.randint(0, 10)
-            })
-            
-            # Move to next month
-            if current_date.month == 12:
-                current_date = datetime(current_date.year + 1, 1, 1)
-            else:
-                current_date = datetime(current_date.year, current_date.month + 1, 1)
-    
-    df_performance = pd.DataFrame(performance)
+    # Generate monthly performance data for every product/month pair
+    months = pd.date_range(START_DATE, END_DATE, freq='MS').strftime('%Y-%m')
+    idx = pd.MultiIndex.from_product(
+        [products['product_id'].to_numpy(), months], names=['product_id', 'year_month']
+    )
+    n = len(idx)
+    
+    df_performance = pd.DataFrame({
+        'energy_consumption_kwh': np.round(rng.uniform(10, 500, n), 2),
+        'failure_rate': np.round(rng.uniform(0, 0.05, n), 4),
+        'customer_satisfaction': np.round(rng.uniform(3, 5, n), 1),
+        'return_rate': np.round(rng.uniform(0, 0.1, n), 4),
+        'warranty_claims': rng.integers(0, 11, n)
+    }, index=idx).reset_index()
+    
     df_performance.to_csv('sample_data/product_performance.csv', index=False)
     print(f"Generated {len(df_performance)} product performance records")
     return df_performance
@@ -6,21 +6,89 @@ with fact and dimension tables for optimized query performance.
 """
 
 import pandas as pd
+import numpy as np
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+# Day and month names, indexed by dayofweek and month - 1
+DAY_NAMES = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+MONTH_NAMES = [
+    'January', 'February', 'March', 'April', 'May', 'June',
+    'July', 'August', 'September', 'October', 'November', 'December'
+]
+
+# Columns read from each processed file (only those the star schema uses)
+# and the narrower types they are cast to; integers are nullable, since
+# processing coerces malformed cells to NA
+PROCESSED_COLUMNS = {
+    'products': [
+        'product_id', 'product_name', 'category', 'subcategory', 'energy_rating', 'price',
+        'manufacturing_cost', 'warranty_years', 'weight_kg', 'profit_margin', 'launch_date'
+    ],
+    'customers': [
+        'customer_id', 'customer_name', 'country', 'segment', 'acquisition_date',
+        'lifetime_value', 'acquisition_year', 'acquisition_month'
+    ],
+    'stores': ['store_id', 'store_name', 'country', 'store_type', 'opening_date', 'size_sqm', 'opening_year'],
+    'sales': [
+        'transaction_id', 'product_id', 'customer_id', 'store_id', 'transaction_date', 'quantity',
+        'unit_price', 'discount', 'final_price', 'total_amount', 'payment_method'
+    ],
+    'performance': [
+        'product_id', 'energy_consumption_kwh', 'failure_rate', 'customer_satisfaction',
+        'return_rate', 'warranty_claims', 'year', 'month'
+    ]
+}
+PROCESSED_DTYPES = {
+    'products': {'warranty_years': 'Int8'},
+    'customers': {'acquisition_year': 'Int16', 'acquisition_month': 'Int8'},
+    'stores': {'size_sqm': 'Int32', 'opening_year': 'Int16'},
+    'sales': {
+        'quantity': 'Int16', 'unit_price': 'float32', 'discount': 'float32',
+        'final_price': 'float32'
+    },
+    'performance': {
+        'energy_consumption_kwh': 'float32', 'failure_rate': 'float32', 'customer_satisfaction': 'float32',
+        'return_rate': 'float32', 'warranty_claims': 'Int16', 'year': 'Int16', 'month': 'Int8'
+    }
+}
+
+# Fact measures stored as float32; prices and rates need well under the
+# ~7 significant digits float32 holds. total_amount stays float64: it is
+# summed into totals of millions, where float32 rounding would lose cents
+SALES_FACT_FLOAT_COLUMNS = ['unit_price', 'discount', 'final_price']
+PERFORMANCE_FACT_FLOAT_COLUMNS = ['energy_consumption_kwh', 'failure_rate', 'customer_satisfaction', 'return_rate']
+
+def read_processed_table(data_dir, table):
+    """Read one processed Parquet file with its column subset and types."""
+    df = pd.read_parquet(f"{data_dir}/{table}_processed.parquet", columns=PROCESSED_COLUMNS[table])
+    return df.astype(PROCESSED_DTYPES[table])
+
 def load_processed_data(data_dir):
-    """Load processed data from CSV files."""
-    products_df = pd.read_csv(f"{data_dir}/products_processed.csv")
-    customers_df = pd.read_csv(f"{data_dir}/customers_processed.csv")
-    stores_df = pd.read_csv(f"{data_dir}/stores_processed.csv")
-    sales_df = pd.read_csv(f"{data_dir}/sales_processed.csv")
-    performance_df = pd.read_csv(f"{data_dir}/performance_processed.csv")
+    """Load processed data from Parquet files."""
+    products_df = read_processed_table(data_dir, 'products')
+    customers_df = read_processed_table(data_dir, 'customers')
+    stores_df = read_processed_table(data_dir, 'stores')
+    sales_df = read_processed_table(data_dir, 'sales')
+    performance_df = read_processed_table(data_dir, 'performance')
     
     print(f"Loaded processed data from {data_dir}")
     
     return products_df, customers_df, stores_df, sales_df, performance_df
 
+def lookup_keys(ids, dim, id_column):
+    """Map natural ids to dimension surrogate keys by position lookup."""
+    # Surrogate keys are the dimension's row positions + 1, so the position
+    # of each id in the dimension's id index is its key - 1. Ids missing
+    # from the dimension (position -1) get NA rather than a key that
+    # matches no row
+    codes = pd.Index(dim[id_column]).get_indexer(ids)
+    missing = codes < 0
+    if missing.any():
+        print(f"{missing.sum()} {id_column} values not found in the dimension; their keys are NA")
+    return pd.arrays.IntegerArray((codes + 1).astype(np.int32), missing)
+
 def create_date_dimension():
     """Create date dimension table."""
     # Generate dates from 2022-01-01 to 2023-12-31
@@ -30,23 +98,31 @@ def create_date_dimension():
     # Create date range
     date_range = pd.date_range(start=start_date, end=end_date, freq='D')
     
-    # Create date dimension dataframe
+    # Extract the date components once; every other attribute is derived
+    # from these arrays
+    day = date_range.day.to_numpy()
+    month = date_range.month.to_numpy()
+    year = date_range.year.to_numpy()
+    day_of_week = date_range.dayofweek.to_numpy()
+    
+    # Create date dimension dataframe with narrow integer types
     date_dim = pd.DataFrame({
-        'date_id': range(1, len(date_range) + 1),
+        'date_id': np.arange(1, len(date_range) + 1, dtype=np.int32),
         'date': date_range,
-        'day': date_range.day,
-        'month': date_range.month,
-        'quarter': date_range.quarter,
-        'year': date_range.year,
-        'day_of_week': date_range.dayofweek,
-        'day_name': date_range.day_name(),
-        'month_name': date_range.month_name(),
-        'is_weekend': date_range.dayofweek.isin([5, 6])
+        'day': day.astype(np.int8),
+        'month': month.astype(np.int8),
+        'quarter': ((month - 1) // 3 + 1).astype(np.int8),
+        'year': year.astype(np.int16),
+        'day_of_week': day_of_week.astype(np.int8),
+        # Names are stored as categorical codes rather than one string per row
+        'day_name': pd.Categorical.from_codes(day_of_week, categories=DAY_NAMES),
+        'month_name': pd.Categorical.from_codes(month - 1, categories=MONTH_NAMES),
+        'is_weekend': day_of_week >= 5,
+        # Create date_key for joining (YYYYMMDD format), computed
+        # arithmetically instead of formatting and re-parsing a string per row
+        'date_key': (year * 10000 + month * 100 + day).astype(np.int32)
     })
     
-    # Create date_key for joining (YYYYMMDD format)
-    date_dim['date_key'] = date_dim['date'].dt.strftime('%Y%m%d').astype(int)
-    
     print(f"Created date dimension with {len(date_dim)} records")
     return date_dim
 
@@ -59,12 +135,8 @@ def create_product_dimension(products_df):
         'weight_kg', 'profit_margin', 'launch_date'
     ]].copy()
     
-    # Add surrogate key
-    product_dim['product_key'] = range(1, len(product_dim) + 1)
-    
-    # Reorder columns to put key first
-    cols = ['product_key'] + [col for col in product_dim.columns if col != 'product_key']
-    product_dim = product_dim[cols]
+    # Add surrogate key as the first column (no reorder copy)
+    product_dim.insert(0, 'product_key', np.arange(1, len(product_dim) + 1, dtype=np.int32))
     
     print(f"Created product dimension with {len(product_dim)} records")
     return product_dim
@@ -77,12 +149,8 @@ def create_customer_dimension(customers_df):
         'acquisition_date', 'lifetime_value', 'acquisition_year', 'acquisition_month'
     ]].copy()
     
-    # Add surrogate key
-    customer_dim['customer_key'] = range(1, len(customer_dim) + 1)
-    
-    # Reorder columns to put key first
-    cols = ['customer_key'] + [col for col in customer_dim.columns if col != 'customer_key']
-    customer_dim = customer_dim[cols]
+    # Add surrogate key as the first column (no reorder copy)
+    customer_dim.insert(0, 'customer_key', np.arange(1, len(customer_dim) + 1, dtype=np.int32))
     
     print(f"Created customer dimension with {len(customer_dim)} records")
     return customer_dim
@@ -95,101 +163,82 @@ def create_store_dimension(stores_df):
         'opening_date', 'size_sqm', 'opening_year'
     ]].copy()
     
-    # Add surrogate key
-    store_dim['store_key'] = range(1, len(store_dim) + 1)
-    
-    # Reorder columns to put key first
-    cols = ['store_key'] + [col for col in store_dim.columns if col != 'store_key']
-    store_dim = store_dim[cols]
+    # Add surrogate key as the first column (no reorder copy)
+    store_dim.insert(0, 'store_key', np.arange(1, len(store_dim) + 1, dtype=np.int32))
     
     print(f"Created store dimension with {len(store_dim)} records")
     return store_dim
 
 def create_sales_fact(sales_df, product_dim, customer_dim, store_dim, date_dim):
     """Create sales fact table."""
-    # Start with a copy of the sales dataframe
-    sales_fact = sales_df.copy()
-    
     # Convert transaction_date to date_key format for joining
-    sales_fact['transaction_date'] = pd.to_datetime(sales_fact['transaction_date'])
-    sales_fact['date_key'] = sales_fact['transaction_date'].dt.strftime('%Y%m%d').astype(int)
-    
-    # Create mapping dictionaries for dimension keys
-    product_key_map = dict(zip(product_dim['product_id'], product_dim['product_key']))
-    customer_key_map = dict(zip(customer_dim['customer_id'], customer_dim['customer_key']))
-    store_key_map = dict(zip(store_dim['store_id'], store_dim['store_key']))
-    
-    # Map dimension keys to fact table
-    sales_fact['product_key'] = sales_fact['product_id'].map(product_key_map)
-    sales_fact['customer_key'] = sales_fact['customer_id'].map(customer_key_map)
-    sales_fact['store_key'] = sales_fact['store_id'].map(store_key_map)
-    
-    # Select only necessary columns for fact table
-    sales_fact = sales_fact[[
-        'transaction_id', 'date_key', 'product_key', 'customer_key', 'store_key',
-        'quantity', 'unit_price', 'discount', 'final_price', 'total_amount', 'payment_method'
-    ]]
-    
-    # Add surrogate key
-    sales_fact['sales_key'] = range(1, len(sales_fact) + 1)
-    
-    # Reorder columns to put key first
-    cols = ['sales_key'] + [col for col in sales_fact.columns if col != 'sales_key']
-    sales_fact = sales_fact[cols]
+    dt = pd.to_datetime(sales_df['transaction_date']).dt
+    
+    # Build the fact table directly from the columns it keeps, mapping
+    # dimension keys on the way, rather than copying the whole sales frame
+    # first and selecting from it afterwards
+    sales_fact = pd.DataFrame({
+        'sales_key': np.arange(1, len(sales_df) + 1, dtype=np.int32),
+        'transaction_id': sales_df['transaction_id'].to_numpy(),
+        # Unparseable transaction dates have no date_key (NA)
+        'date_key': (dt.year * 10000 + dt.month * 100 + dt.day).astype('Int32').array,
+        'product_key': lookup_keys(sales_df['product_id'], product_dim, 'product_id'),
+        'customer_key': lookup_keys(sales_df['customer_id'], customer_dim, 'customer_id'),
+        'store_key': lookup_keys(sales_df['store_id'], store_dim, 'store_id'),
+        # Downcast the measures so the saved fact table holds 4-byte floats
+        # and a 2-byte quantity whatever types the processed data arrived
+        # with; the quantity stays nullable so coerced cells remain NA
+        'quantity': sales_df['quantity'].astype('Int16').array,
+        **{c: pd.to_numeric(sales_df[c], downcast='float').to_numpy() for c in SALES_FACT_FLOAT_COLUMNS},
+        'total_amount': sales_df['total_amount'].to_numpy(dtype=np.float64),
+        # Payment method has a handful of distinct values; store it as int8
+        # codes plus a lookup, written as a dictionary-encoded Parquet column
+        'payment_method': pd.Categorical(sales_df['payment_method'])
+    })
     
     print(f"Created sales fact table with {len(sales_fact)} records")
     return sales_fact
 
 def create_performance_fact(performance_df, product_dim, date_dim):
     """Create product performance fact table."""
-    # Start with a copy of the performance dataframe
-    performance_fact = performance_df.copy()
-    
-    # Create date_key from year and month
-    performance_fact['date_key'] = (
-        performance_fact['year'].astype(str) + 
-        performance_fact['month'].astype(str).str.zfill(2) + 
-        '01'  # First day of month
-    ).astype(int)
-    
-    # Create mapping dictionary for product keys
-    product_key_map = dict(zip(product_dim['product_id'], product_dim['product_key']))
-    
-    # Map product keys to fact table
-    performance_fact['product_key'] = performance_fact['product_id'].map(product_key_map)
-    
-    # Select only necessary columns for fact table
-    performance_fact = performance_fact[[
-        'date_key', 'product_key', 'energy_consumption_kwh', 'failure_rate',
-        'customer_satisfaction', 'return_rate', 'warranty_claims'
-    ]]
-    
-    # Add surrogate key
-    performance_fact['performance_key'] = range(1, len(performance_fact) + 1)
-    
-    # Reorder columns to put key first
-    cols = ['performance_key'] + [col for col in performance_fact.columns if col != 'performance_key']
-    performance_fact = performance_fact[cols]
+    # Create date_key from year and month (first day of month), widened
+    # from their narrow stored types so the arithmetic cannot overflow;
+    # the nullable type carries any missing year or month through as NA
+    year = performance_df['year'].astype('Int32').array
+    month = performance_df['month'].astype('Int32').array
+    
+    # Build the fact table directly from the columns it keeps
+    performance_fact = pd.DataFrame({
+        'performance_key': np.arange(1, len(performance_df) + 1, dtype=np.int32),
+        'date_key': year * 10000 + month * 100 + 1,
+        'product_key': lookup_keys(performance_df['product_id'], product_dim, 'product_id'),
+        # Downcast the measures to float32 / nullable Int16
+        **{c: pd.to_numeric(performance_df[c], downcast='float').to_numpy() for c in PERFORMANCE_FACT_FLOAT_COLUMNS},
+        'warranty_claims': performance_df['warranty_claims'].astype('Int16').array
+    })
     
     print(f"Created performance fact table with {len(performance_fact)} records")
     return performance_fact
 
 def save_star_schema(tables, output_dir):
-    """Save star schema tables to CSV files."""
+    """Save star schema tables to Parquet files."""
     date_dim, product_dim, customer_dim, store_dim, sales_fact, performance_fact = tables
     
     # Create output directory if it doesn't exist
     os.makedirs(output_dir, exist_ok=True)
     
+    # Parquet keeps column types and is far faster to write and re-read
+    # than CSV
+    
     # Save dimension tables
-    date_dim.to_csv(f"{output_dir}/dim_date.csv", index=False)
-    product_dim.to_csv(f"{output_dir}/dim_product.csv", index=False)
-    customer_dim.to_csv(f"{output_dir}/dim_customer.csv", index=False)
-    store_dim.to_csv(f"{output_dir}/dim_store.csv", index=False)
+    date_dim.to_parquet(f"{output_dir}/dim_date.parquet", compression='snappy', index=False)
+    product_dim.to_parquet(f"{output_dir}/dim_product.parquet", compression='snappy', index=False)
+    customer_dim.to_parquet(f"{output_dir}/dim_customer.parquet", compression='snappy', index=False)
+    store_dim.to_parquet(f"{output_dir}/dim_store.parquet", compression='snappy', index=False)
     
     # Save fact tables
-    sales_fact.to_csv(f"{output_dir}/fact_sales.csv", index=False)
-    performance_fact.to_csv(f"{output_dir}/fact_performance.csv", index=False)
+    sales_fact.to_parquet(f"{output_dir}/fact_sales.parquet", compression='snappy', index=False)
+    performance_fact.to_parquet(f"{output_dir}/fact_performance.parquet", compression='snappy', index=False)
     
     print(f"Star schema tables saved to {output_dir}")
 
@@ -204,11 +253,17 @@ def main():
     # Load processed data
     products_df, customers_df, stores_df, sales_df, performance_df = load_processed_data(input_dir)
     
-    # Create dimension tables
-    date_dim = create_date_dimension()
-    product_dim = create_product_dimension(products_df)
-    customer_dim = create_customer_dimension(customers_df)
-    store_dim = create_store_dimension(stores_df)
+    # Create dimension tables; the builders are independent, so they run
+    # concurrently and the wall-clock time approaches that of the slowest
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        date_future = executor.submit(create_date_dimension)
+        product_future = executor.submit(create_product_dimension, products_df)
+        customer_future = executor.submit(create_customer_dimension, customers_df)
+        store_future = executor.submit(create_store_dimension, stores_df)
+        date_dim = date_future.result()
+        product_dim = product_future.result()
+        customer_dim = customer_future.result()
+        store_dim = store_future.result()
     
     # Create fact tables
     sales_fact = create_sales_fact(sales_df, product_dim, customer_dim, store_dim, date_dim)
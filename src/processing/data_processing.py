@@ -5,18 +5,77 @@ This script performs data cleaning, standardization, and transformation
 on the sample electric product dataset.
 """
 
+from pyspark import StorageLevel
 from pyspark.sql import SparkSession
 from pyspark.sql.functions import col, when, regexp_replace, trim, upper, lower
-from pyspark.sql.functions import year, month, dayofmonth, date_format, to_date
+from pyspark.sql.functions import year, month, dayofmonth, date_format, to_date, split
 from pyspark.sql.functions import round as spark_round
-from pyspark.sql.types import DoubleType, IntegerType
+from pyspark.sql.functions import broadcast, row_number, monotonically_increasing_id
+from pyspark.sql.window import Window
+from pyspark.sql.types import StructType, StructField, StringType, DoubleType, IntegerType
 import os
 
+# Explicit CSV schemas, so Spark reads each file in a single pass instead
+# of scanning it once more to infer types. Dates are kept as strings and
+# parsed during cleaning.
+PRODUCTS_SCHEMA = StructType([
+    StructField("product_id", StringType(), True),
+    StructField("product_name", StringType(), True),
+    StructField("category", StringType(), True),
+    StructField("subcategory", StringType(), True),
+    StructField("energy_rating", StringType(), True),
+    StructField("price", DoubleType(), True),
+    StructField("manufacturing_cost", DoubleType(), True),
+    StructField("warranty_years", IntegerType(), True),
+    StructField("weight_kg", DoubleType(), True),
+    StructField("stock_quantity", IntegerType(), True),
+    StructField("launch_date", StringType(), True)
+])
+CUSTOMERS_SCHEMA = StructType([
+    StructField("customer_id", StringType(), True),
+    StructField("customer_name", StringType(), True),
+    StructField("country", StringType(), True),
+    StructField("segment", StringType(), True),
+    StructField("acquisition_date", StringType(), True),
+    StructField("lifetime_value", DoubleType(), True)
+])
+STORES_SCHEMA = StructType([
+    StructField("store_id", StringType(), True),
+    StructField("store_name", StringType(), True),
+    StructField("country", StringType(), True),
+    StructField("store_type", StringType(), True),
+    StructField("opening_date", StringType(), True),
+    StructField("size_sqm", IntegerType(), True)
+])
+SALES_SCHEMA = StructType([
+    StructField("transaction_id", StringType(), True),
+    StructField("product_id", StringType(), True),
+    StructField("customer_id", StringType(), True),
+    StructField("store_id", StringType(), True),
+    StructField("transaction_date", StringType(), True),
+    StructField("quantity", IntegerType(), True),
+    StructField("unit_price", DoubleType(), True),
+    StructField("discount", DoubleType(), True),
+    StructField("final_price", DoubleType(), True),
+    StructField("total_amount", DoubleType(), True),
+    StructField("payment_method", StringType(), True)
+])
+PERFORMANCE_SCHEMA = StructType([
+    StructField("product_id", StringType(), True),
+    StructField("year_month", StringType(), True),
+    StructField("energy_consumption_kwh", DoubleType(), True),
+    StructField("failure_rate", DoubleType(), True),
+    StructField("customer_satisfaction", DoubleType(), True),
+    StructField("return_rate", DoubleType(), True),
+    StructField("warranty_claims", IntegerType(), True)
+])
+
 def initialize_spark():
     """Initialize Spark session."""
     spark = SparkSession.builder \
         .appName("Electric Product Data Processing") \
         .config("spark.driver.memory", "2g") \
+        .config("spark.sql.parquet.compression.codec", "snappy") \
         .getOrCreate()
     
     print("Spark session initialized")
@@ -24,18 +83,15 @@ def initialize_spark():
 
 def load_data(spark, data_dir):
     """Load data from CSV files."""
-    products_df = spark.read.csv(f"{data_dir}/products.csv", header=True, inferSchema=True)
-    customers_df = spark.read.csv(f"{data_dir}/customers.csv", header=True, inferSchema=True)
-    stores_df = spark.read.csv(f"{data_dir}/stores.csv", header=True, inferSchema=True)
-    sales_df = spark.read.csv(f"{data_dir}/sales.csv", header=True, inferSchema=True)
-    performance_df = spark.read.csv(f"{data_dir}/product_performance.csv", header=True, inferSchema=True)
-    
+    products_df = spark.read.schema(PRODUCTS_SCHEMA).csv(f"{data_dir}/products.csv", header=True)
+    customers_df = spark.read.schema(CUSTOMERS_SCHEMA).csv(f"{data_dir}/customers.csv", header=True)
+    stores_df = spark.read.schema(STORES_SCHEMA).csv(f"{data_dir}/stores.csv", header=True)
+    sales_df = spark.read.schema(SALES_SCHEMA).csv(f"{data_dir}/sales.csv", header=True)
+    performance_df = spark.read.schema(PERFORMANCE_SCHEMA).csv(f"{data_dir}/product_performance.csv", header=True)
+    
+    # Reads are lazy; record counts are not printed here because each
+    # count() would scan its whole file before processing even starts
     print(f"Loaded data from {data_dir}")
-    print(f"Products: {products_df.count()} records")
-    print(f"Customers: {customers_df.count()} records")
-    print(f"Stores: {stores_df.count()} records")
-    print(f"Sales: {sales_df.count()} records")
-    print(f"Performance: {performance_df.count()} records")
     
     return products_df, customers_df, stores_df, sales_df, performance_df
 
@@ -44,23 +100,28 @@ def clean_products_data(df):
     # Handle missing values
     df = df.na.fill({"warranty_years": 1, "weight_kg": 0.0, "stock_quantity": 0})
     
-    # Standardize text fields
-    df = df.withColumn("product_name", trim(df.product_name))
-    df = df.withColumn("category", upper(df.category))
-    df = df.withColumn("subcategory", trim(df.subcategory))
-    
-    # Convert data types
-    df = df.withColumn("price", col("price").cast(DoubleType()))
-    df = df.withColumn("manufacturing_cost", col("manufacturing_cost").cast(DoubleType()))
-    df = df.withColumn("weight_kg", col("weight_kg").cast(DoubleType()))
-    df = df.withColumn("stock_quantity", col("stock_quantity").cast(IntegerType()))
-    
-    # Add derived columns
-    df = df.withColumn("profit_margin", 
-                      spark_round((col("price") - col("manufacturing_cost")) / col("price") * 100, 2))
-    
-    # Convert date strings to date type
-    df = df.withColumn("launch_date", to_date(col("launch_date"), "yyyy-MM-dd"))
+    # Build every column in a single projection instead of a chain of
+    # withColumn calls
+    price = col("price").cast(DoubleType())
+    manufacturing_cost = col("manufacturing_cost").cast(DoubleType())
+    df = df.select(
+        col("product_id"),
+        # Standardize text fields
+        trim(col("product_name")).alias("product_name"),
+        upper(col("category")).alias("category"),
+        trim(col("subcategory")).alias("subcategory"),
+        col("energy_rating"),
+        # Convert data types
+        price.alias("price"),
+        manufacturing_cost.alias("manufacturing_cost"),
+        col("warranty_years"),
+        col("weight_kg").cast(DoubleType()).alias("weight_kg"),
+        col("stock_quantity").cast(IntegerType()).alias("stock_quantity"),
+        # Convert date strings to date type
+        to_date(col("launch_date"), "yyyy-MM-dd").alias("launch_date"),
+        # Add derived columns
+        spark_round((price - manufacturing_cost) / price * 100, 2).alias("profit_margin")
+    )
     
     print("Products data cleaned and standardized")
     return df
@@ -70,20 +131,22 @@ def clean_customers_data(df):
     # Handle missing values
     df = df.na.fill({"lifetime_value": 0.0})
     
-    # Standardize text fields
-    df = df.withColumn("customer_name", trim(df.customer_name))
-    df = df.withColumn("country", upper(df.country))
-    df = df.withColumn("segment", trim(df.segment))
-    
-    # Convert data types
-    df = df.withColumn("lifetime_value", col("lifetime_value").cast(DoubleType()))
-    
-    # Convert date strings to date type
-    df = df.withColumn("acquisition_date", to_date(col("acquisition_date"), "yyyy-MM-dd"))
-    
-    # Add derived columns
-    df = df.withColumn("acquisition_year", year(col("acquisition_date")))
-    df = df.withColumn("acquisition_month", month(col("acquisition_date")))
+    # Build every column in a single projection
+    acquisition_date = to_date(col("acquisition_date"), "yyyy-MM-dd")
+    df = df.select(
+        col("customer_id"),
+        # Standardize text fields
+        trim(col("customer_name")).alias("customer_name"),
+        upper(col("country")).alias("country"),
+        trim(col("segment")).alias("segment"),
+        # Convert date strings to date type
+        acquisition_date.alias("acquisition_date"),
+        # Convert data types
+        col("lifetime_value").cast(DoubleType()).alias("lifetime_value"),
+        # Add derived columns
+        year(acquisition_date).alias("acquisition_year"),
+        month(acquisition_date).alias("acquisition_month")
+    )
     
     print("Customers data cleaned and standardized")
     return df
@@ -93,19 +156,21 @@ def clean_stores_data(df):
     # Handle missing values
     df = df.na.fill({"size_sqm": 0})
     
-    # Standardize text fields
-    df = df.withColumn("store_name", trim(df.store_name))
-    df = df.withColumn("country", upper(df.country))
-    df = df.withColumn("store_type", trim(df.store_type))
-    
-    # Convert data types
-    df = df.withColumn("size_sqm", col("size_sqm").cast(IntegerType()))
-    
-    # Convert date strings to date type
-    df = df.withColumn("opening_date", to_date(col("opening_date"), "yyyy-MM-dd"))
-    
-    # Add derived columns
-    df = df.withColumn("opening_year", year(col("opening_date")))
+    # Build every column in a single projection
+    opening_date = to_date(col("opening_date"), "yyyy-MM-dd")
+    df = df.select(
+        col("store_id"),
+        # Standardize text fields
+        trim(col("store_name")).alias("store_name"),
+        upper(col("country")).alias("country"),
+        trim(col("store_type")).alias("store_type"),
+        # Convert date strings to date type
+        opening_date.alias("opening_date"),
+        # Convert data types
+        col("size_sqm").cast(IntegerType()).alias("size_sqm"),
+        # Add derived columns
+        year(opening_date).alias("opening_year")
+    )
     
     print("Stores data cleaned and standardized")
     return df
@@ -115,23 +180,28 @@ def clean_sales_data(df):
     # Handle missing values
     df = df.na.fill({"quantity": 1, "discount": 0.0})
     
-    # Convert data types
-    df = df.withColumn("quantity", col("quantity").cast(IntegerType()))
-    df = df.withColumn("unit_price", col("unit_price").cast(DoubleType()))
-    df = df.withColumn("discount", col("discount").cast(DoubleType()))
-    df = df.withColumn("final_price", col("final_price").cast(DoubleType()))
-    df = df.withColumn("total_amount", col("total_amount").cast(DoubleType()))
-    
-    # Standardize text fields
-    df = df.withColumn("payment_method", trim(df.payment_method))
-    
-    # Convert date strings to date type
-    df = df.withColumn("transaction_date", to_date(col("transaction_date"), "yyyy-MM-dd"))
-    
-    # Add derived columns
-    df = df.withColumn("transaction_year", year(col("transaction_date")))
-    df = df.withColumn("transaction_month", month(col("transaction_date")))
-    df = df.withColumn("transaction_day", dayofmonth(col("transaction_date")))
+    # Build every column in a single projection
+    transaction_date = to_date(col("transaction_date"), "yyyy-MM-dd")
+    df = df.select(
+        col("transaction_id"),
+        col("product_id"),
+        col("customer_id"),
+        col("store_id"),
+        # Convert date strings to date type
+        transaction_date.alias("transaction_date"),
+        # Convert data types
+        col("quantity").cast(IntegerType()).alias("quantity"),
+        col("unit_price").cast(DoubleType()).alias("unit_price"),
+        col("discount").cast(DoubleType()).alias("discount"),
+        col("final_price").cast(DoubleType()).alias("final_price"),
+        col("total_amount").cast(DoubleType()).alias("total_amount"),
+        # Standardize text fields
+        trim(col("payment_method")).alias("payment_method"),
+        # Add derived columns
+        year(transaction_date).alias("transaction_year"),
+        month(transaction_date).alias("transaction_month"),
+        dayofmonth(transaction_date).alias("transaction_day")
+    )
     
     print("Sales data cleaned and standardized")
     return df
@@ -147,20 +217,68 @@ def clean_performance_data(df):
         "warranty_claims": 0
     })
     
-    # Convert data types
-    df = df.withColumn("energy_consumption_kwh", col("energy_consumption_kwh").cast(DoubleType()))
-    df = df.withColumn("failure_rate", col("failure_rate").cast(DoubleType()))
-    df = df.withColumn("customer_satisfaction", col("customer_satisfaction").cast(DoubleType()))
-    df = df.withColumn("return_rate", col("return_rate").cast(DoubleType()))
-    df = df.withColumn("warranty_claims", col("warranty_claims").cast(IntegerType()))
-    
-    # Extract year and month from year_month field
-    df = df.withColumn("year", col("year_month").substr(1, 4).cast(IntegerType()))
-    df = df.withColumn("month", col("year_month").substr(6, 2).cast(IntegerType()))
+    # Build every column in a single projection; year_month is split
+    # once and both parts are taken from the same array
+    year_month_parts = split(col("year_month"), "-")
+    df = df.select(
+        col("product_id"),
+        col("year_month"),
+        # Convert data types
+        col("energy_consumption_kwh").cast(DoubleType()).alias("energy_consumption_kwh"),
+        col("failure_rate").cast(DoubleType()).alias("failure_rate"),
+        col("customer_satisfaction").cast(DoubleType()).alias("customer_satisfaction"),
+        col("return_rate").cast(DoubleType()).alias("return_rate"),
+        col("warranty_claims").cast(IntegerType()).alias("warranty_claims"),
+        # Extract year and month from year_month field
+        year_month_parts.getItem(0).cast(IntegerType()).alias("year"),
+        year_month_parts.getItem(1).cast(IntegerType()).alias("month")
+    )
     
     print("Performance data cleaned and standardized")
     return df
 
+def add_row_key(df, key_column):
+    """Add a 1-based key numbering the rows of a table in file order."""
+    # The pandas star schema keys rows by their position in the processed
+    # file. monotonically_increasing_id follows that order, since partitions
+    # are numbered by file split and count upwards within each, but it leaves
+    # gaps between partitions; row_number over it closes them, so the keys
+    # run 1..N and match. The numbering sorts in a single partition
+    df = df.withColumn("row_order", monotonically_increasing_id())
+    return df.withColumn(key_column, row_number().over(Window.orderBy("row_order"))).drop("row_order")
+
+def create_sales_fact(sales_df, product_dim, customer_dim, store_dim):
+    """Create sales fact table, joining dimension keys with broadcast hash joins."""
+    # Number the sales rows before the joins reorder them
+    sales_fact = add_row_key(sales_df, "sales_key")
+    
+    # The dimensions fit in every executor, so broadcasting their id/key
+    # pairs avoids shuffling the sales data for each join
+    sales_fact = sales_fact \
+        .join(broadcast(product_dim.select("product_id", "product_key")), "product_id", "left") \
+        .join(broadcast(customer_dim.select("customer_id", "customer_key")), "customer_id", "left") \
+        .join(broadcast(store_dim.select("store_id", "store_key")), "store_id", "left")
+    
+    # Select fact columns; date_key is YYYYMMDD
+    sales_fact = sales_fact.select(
+        col("sales_key"),
+        col("transaction_id"),
+        (col("transaction_year") * 10000 + col("transaction_month") * 100 + col("transaction_day"))
+            .alias("date_key"),
+        col("product_key"),
+        col("customer_key"),
+        col("store_key"),
+        col("quantity"),
+        col("unit_price"),
+        col("discount"),
+        col("final_price"),
+        col("total_amount"),
+        col("payment_method")
+    )
+    
+    print("Sales fact table created")
+    return sales_fact
+
 def save_processed_data(dfs, output_dir):
     """Save processed dataframes to parquet files."""
     products_df, customers_df, stores_df, sales_df, performance_df = dfs
@@ -172,8 +290,14 @@ def save_processed_data(dfs, output_dir):
     products_df.write.mode("overwrite").parquet(f"{output_dir}/products")
     customers_df.write.mode("overwrite").parquet(f"{output_dir}/customers")
     stores_df.write.mode("overwrite").parquet(f"{output_dir}/stores")
-    sales_df.write.mode("overwrite").parquet(f"{output_dir}/sales")
-    performance_df.write.mode("overwrite").parquet(f"{output_dir}/performance")
+    
+    # Partition the fact data by date so readers filtering on a period only
+    # scan the matching directories; repartitioning on the same columns
+    # first writes one file per partition instead of one per task
+    sales_df.repartition("transaction_year", "transaction_month").write.mode("overwrite") \
+        .partitionBy("transaction_year", "transaction_month").parquet(f"{output_dir}/sales")
+    performance_df.repartition("year").write.mode("overwrite") \
+        .partitionBy("year").parquet(f"{output_dir}/performance")
     
     print(f"Processed data saved to {output_dir}")
 
@@ -187,6 +311,7 @@ def main():
     # Define input and output directories
     input_dir = "src/data/sample_data"
     output_dir = "src/data/processed_data"
+    star_schema_dir = "src/models/star_schema"
     
     # Load data
     products_df, customers_df, stores_df, sales_df, performance_df = load_data(spark, input_dir)
@@ -198,12 +323,26 @@ def main():
     sales_df_clean = clean_sales_data(sales_df)
     performance_df_clean = clean_performance_data(performance_df)
     
+    # Persist the cleaned tables that are saved and then joined and/or
+    # shown again, which would otherwise re-run their CSV read and cleaning
+    reused_dfs = (products_df_clean, customers_df_clean, stores_df_clean, sales_df_clean)
+    for df in reused_dfs:
+        df.persist(StorageLevel.MEMORY_AND_DISK)
+    
     # Save processed data
     save_processed_data(
         (products_df_clean, customers_df_clean, stores_df_clean, sales_df_clean, performance_df_clean),
         output_dir
     )
     
+    # Build the sales fact in Spark so the key lookups run in parallel; it
+    # is saved with the star schema tables, keyed the same way
+    product_dim = add_row_key(products_df_clean, "product_key")
+    customer_dim = add_row_key(customers_df_clean, "customer_key")
+    store_dim = add_row_key(stores_df_clean, "store_key")
+    sales_fact = create_sales_fact(sales_df_clean, product_dim, customer_dim, store_dim)
+    sales_fact.write.mode("overwrite").parquet(f"{star_schema_dir}/fact_sales")
+    
     # Show sample of processed data
     print("\nSample of processed products data:")
     products_df_clean.show(5)
@@ -211,6 +350,9 @@ def main():
     print("\nSample of processed sales data:")
     sales_df_clean.show(5)
     
+    for df in reused_dfs:
+        df.unpersist()
+    
     print("Electric product data processing completed successfully!")
     
     # Stop Spark session
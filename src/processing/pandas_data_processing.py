@@ -8,49 +8,212 @@ due to environment constraints.
 
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+# numexpr is optional; without it derived columns use plain NumPy
+try:
+    import numexpr as ne
+except ImportError:
+    ne = None
+
+# Numba is optional; without it the profit margin falls back to numexpr/NumPy
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# Parse CSVs in 8 MiB blocks across all cores
+CSV_READ_OPTIONS = pacsv.ReadOptions(block_size=8 << 20, use_threads=True)
+
+# Parquet output settings; dictionary encoding keeps the categorical
+# columns as codes on disk
+PARQUET_WRITE_OPTIONS = {'compression': 'zstd', 'use_dictionary': True}
+
+# Raw CSV file of each table
+RAW_FILES = {
+    'products': 'products.csv', 'customers': 'customers.csv', 'stores': 'stores.csv',
+    'sales': 'sales.csv', 'performance': 'product_performance.csv'
+}
+
+# Tables load_data reads whole; sales is streamed by process_sales_data
+LOADED_TABLES = ['products', 'customers', 'stores', 'performance']
+
+# Column types of each raw CSV file, applied by the parser so numbers and
+# dates arrive already converted; columns not listed are inferred
+RAW_COLUMN_TYPES = {
+    'products': {
+        'product_id': pa.string(), 'price': pa.float64(), 'manufacturing_cost': pa.float64(),
+        'warranty_years': pa.int64(), 'weight_kg': pa.float64(), 'stock_quantity': pa.int32(),
+        'launch_date': pa.timestamp('s')
+    },
+    'customers': {
+        'customer_id': pa.string(), 'acquisition_date': pa.timestamp('s'), 'lifetime_value': pa.float64()
+    },
+    'stores': {
+        'store_id': pa.string(), 'opening_date': pa.timestamp('s'), 'size_sqm': pa.int32()
+    },
+    'sales': {
+        'transaction_id': pa.string(), 'product_id': pa.string(), 'customer_id': pa.string(),
+        'store_id': pa.string(), 'transaction_date': pa.timestamp('s'), 'quantity': pa.int64(),
+        'unit_price': pa.float64(), 'discount': pa.float64(), 'final_price': pa.float64(),
+        'total_amount': pa.float64()
+    },
+    'performance': {
+        'product_id': pa.string(), 'year_month': pa.string(), 'energy_consumption_kwh': pa.float64(),
+        'failure_rate': pa.float64(), 'customer_satisfaction': pa.float64(), 'return_rate': pa.float64(),
+        'warranty_claims': pa.int64()
+    }
+}
+
+def text_convert_options(column_types):
+    """Return CSV convert options that read every given column as text."""
+    # Empty and null-marker cells still become nulls, as they do in the
+    # typed columns, so the fillna defaults of the clean_* functions apply
+    return pacsv.ConvertOptions(column_types=dict.fromkeys(column_types, pa.string()), strings_can_be_null=True)
+
+def read_csv_typed(path, column_types):
+    """Read a CSV file with pyarrow's multithreaded parser and the given column types."""
+    # Parse straight from the memory-mapped file; the page cache backs the
+    # input, so no copy of the raw bytes is buffered in the process
+    try:
+        with pa.memory_map(path, 'r') as source:
+            table = pacsv.read_csv(
+                source, read_options=CSV_READ_OPTIONS,
+                convert_options=pacsv.ConvertOptions(column_types=column_types)
+            )
+    except pa.ArrowInvalid:
+        # A malformed number or date fails the typed parse; read the file
+        # again as text so the clean_* functions coerce the bad cells to
+        # NaN/NaT instead
+        with pa.memory_map(path, 'r') as source:
+            table = pacsv.read_csv(
+                source, read_options=CSV_READ_OPTIONS,
+                convert_options=text_convert_options(column_types)
+            )
+    # One block per column: every column, including those the clean_*
+    # functions add, stays a contiguous 1-D array and no consolidation
+    # copy is made into shared 2-D blocks
+    return table.to_pandas(split_blocks=True)
+
+def ensure_numeric(df, column, dtype):
+    """Coerce a column to a numeric dtype unless it already has that dtype."""
+    # The typed CSV reader usually delivers the right dtype already, so the
+    # element-wise coercion only runs on columns that actually need it
+    if df[column].dtype == dtype:
+        return
+    
+    # Numeric columns of another width only need a cast; to_numeric's
+    # coercion pass is kept for text columns
+    if pd.api.types.is_numeric_dtype(df[column]):
+        df[column] = df[column].astype(dtype)
+    else:
+        df[column] = pd.to_numeric(df[column], errors='coerce').astype(dtype)
+
+def ensure_datetime(df, column):
+    """Parse a date column unless it already has a datetime dtype."""
+    # Columns the typed CSV reader parsed need no work; text columns use a
+    # fixed format, and cache=True parses each distinct date string once and
+    # maps the result back to every row that repeats it
+    if pd.api.types.is_datetime64_any_dtype(df[column]):
+        return
+    df[column] = pd.to_datetime(df[column], format='%Y-%m-%d', errors='coerce', cache=True)
+
+def map_categories(series, func):
+    """Apply a string transform to a low-cardinality column once per distinct value."""
+    # The transform runs over the categories rather than every row; the
+    # result is recast in case it merges categories (e.g. 'Hvac' and 'HVAC')
+    return series.astype('category').map(func, na_action='ignore').astype('category')
+
+def profit_margin_loop(price, cost, out):
+    """Compute rounded profit margin percentages row by row into out."""
+    # Same arithmetic as np.round(margin, 2): scale, round half to even, unscale
+    for i in range(price.size):
+        out[i] = np.rint((price[i] - cost[i]) / price[i] * 100 * 100) / 100
+
+# Sequential JIT loop: it runs inside the cleaning thread pool, and numba's
+# parallel workqueue hangs at exit when launched from a non-main thread.
+# NumPy's error model makes a zero price give inf/NaN as the NumPy path does
+# instead of raising, and fastmath is left off because prices may be NaN
+profit_margin_kernel = (
+    njit(cache=True, error_model='numpy')(profit_margin_loop) if njit is not None else None
+)
+
+def profit_margin(price, cost):
+    """Compute profit margin percentages, rounded to 2 decimals."""
+    # The compiled kernel fuses every step into one loop over the rows
+    if profit_margin_kernel is not None:
+        out = np.empty(price.size)
+        profit_margin_kernel(price.astype(np.float64), cost.astype(np.float64), out)
+        return out
+    
+    # numexpr evaluates the whole expression in one pass over cache-sized
+    # chunks instead of materializing each intermediate array
+    if ne is not None:
+        margin = ne.evaluate('(price - cost) / price * 100')
+    else:
+        margin = (price - cost) / price * 100
+    return np.round(margin, 2)
+
+def date_parts(dates):
+    """Split a datetime column into year, month and day arrays."""
+    # Missing dates have no integer parts; leave those to the .dt accessors
+    if dates.isna().any():
+        return dates.dt.year, dates.dt.month, dates.dt.day
+    
+    # Truncate the datetime64 buffer to days, months and years once and
+    # take the parts as differences, instead of three separate .dt scans
+    days = dates.to_numpy().astype('datetime64[D]')
+    months = days.astype('datetime64[M]')
+    years = months.astype('datetime64[Y]')
+    year = years.astype(np.int32) + 1970
+    month = (months - years).astype(np.int32) + 1
+    day = (days - months).astype(np.int32) + 1
+    return year, month, day
+
 def load_data(data_dir):
-    """Load data from CSV files."""
-    products_df = pd.read_csv(f"{data_dir}/products.csv")
-    customers_df = pd.read_csv(f"{data_dir}/customers.csv")
-    stores_df = pd.read_csv(f"{data_dir}/stores.csv")
-    sales_df = pd.read_csv(f"{data_dir}/sales.csv")
-    performance_df = pd.read_csv(f"{data_dir}/product_performance.csv")
+    """Load data from CSV files (sales is streamed by process_sales_data)."""
+    # Read all tables concurrently; pyarrow releases the GIL while parsing,
+    # so the wall-clock time approaches that of the largest file
+    paths = {table: f"{data_dir}/{RAW_FILES[table]}" for table in LOADED_TABLES}
+    with ThreadPoolExecutor(max_workers=len(paths)) as executor:
+        frames = executor.map(lambda table: read_csv_typed(paths[table], RAW_COLUMN_TYPES[table]), paths)
+        products_df, customers_df, stores_df, performance_df = frames
     
     print(f"Loaded data from {data_dir}")
     print(f"Products: {len(products_df)} records")
     print(f"Customers: {len(customers_df)} records")
     print(f"Stores: {len(stores_df)} records")
-    print(f"Sales: {len(sales_df)} records")
     print(f"Performance: {len(performance_df)} records")
     
-    return products_df, customers_df, stores_df, sales_df, performance_df
+    return products_df, customers_df, stores_df, performance_df
 
 def clean_products_data(df):
     """Clean and standardize products data."""
     # Handle missing values
-    df['warranty_years'] = df['warranty_years'].fillna(1)
-    df['weight_kg'] = df['weight_kg'].fillna(0.0)
-    df['stock_quantity'] = df['stock_quantity'].fillna(0)
+    df.fillna({'warranty_years': 1, 'weight_kg': 0.0, 'stock_quantity': 0}, inplace=True)
     
     # Standardize text fields
     df['product_name'] = df['product_name'].str.strip()
-    df['category'] = df['category'].str.upper()
+    df['category'] = map_categories(df['category'], str.upper)
     df['subcategory'] = df['subcategory'].str.strip()
     
     # Convert data types
-    df['price'] = pd.to_numeric(df['price'], errors='coerce')
-    df['manufacturing_cost'] = pd.to_numeric(df['manufacturing_cost'], errors='coerce')
-    df['weight_kg'] = pd.to_numeric(df['weight_kg'], errors='coerce')
-    df['stock_quantity'] = pd.to_numeric(df['stock_quantity'], errors='coerce').astype('Int64')
+    ensure_numeric(df, 'price', 'float64')
+    ensure_numeric(df, 'manufacturing_cost', 'float64')
+    ensure_numeric(df, 'weight_kg', 'float64')
+    ensure_numeric(df, 'warranty_years', 'Int8')
+    ensure_numeric(df, 'stock_quantity', 'Int32')
     
     # Add derived columns
-    df['profit_margin'] = round((df['price'] - df['manufacturing_cost']) / df['price'] * 100, 2)
+    df['profit_margin'] = profit_margin(df['price'].to_numpy(), df['manufacturing_cost'].to_numpy())
     
     # Convert date strings to date type
-    df['launch_date'] = pd.to_datetime(df['launch_date'], errors='coerce')
+    ensure_datetime(df, 'launch_date')
     
     print("Products data cleaned and standardized")
     return df
@@ -58,22 +221,22 @@ def clean_products_data(df):
 def clean_customers_data(df):
     """Clean and standardize customers data."""
     # Handle missing values
-    df['lifetime_value'] = df['lifetime_value'].fillna(0.0)
+    df.fillna({'lifetime_value': 0.0}, inplace=True)
     
     # Standardize text fields
     df['customer_name'] = df['customer_name'].str.strip()
-    df['country'] = df['country'].str.upper()
-    df['segment'] = df['segment'].str.strip()
+    df['country'] = map_categories(df['country'], str.upper)
+    df['segment'] = map_categories(df['segment'], str.strip)
     
     # Convert data types
-    df['lifetime_value'] = pd.to_numeric(df['lifetime_value'], errors='coerce')
+    ensure_numeric(df, 'lifetime_value', 'float64')
     
     # Convert date strings to date type
-    df['acquisition_date'] = pd.to_datetime(df['acquisition_date'], errors='coerce')
+    ensure_datetime(df, 'acquisition_date')
     
     # Add derived columns
-    df['acquisition_year'] = df['acquisition_date'].dt.year
-    df['acquisition_month'] = df['acquisition_date'].dt.month
+    df['acquisition_year'] = df['acquisition_date'].dt.year.astype('Int16')
+    df['acquisition_month'] = df['acquisition_date'].dt.month.astype('Int8')
     
     print("Customers data cleaned and standardized")
     return df
@@ -81,21 +244,21 @@ def clean_customers_data(df):
 def clean_stores_data(df):
     """Clean and standardize stores data."""
     # Handle missing values
-    df['size_sqm'] = df['size_sqm'].fillna(0)
+    df.fillna({'size_sqm': 0}, inplace=True)
     
     # Standardize text fields
     df['store_name'] = df['store_name'].str.strip()
-    df['country'] = df['country'].str.upper()
-    df['store_type'] = df['store_type'].str.strip()
+    df['country'] = map_categories(df['country'], str.upper)
+    df['store_type'] = map_categories(df['store_type'], str.strip)
     
     # Convert data types
-    df['size_sqm'] = pd.to_numeric(df['size_sqm'], errors='coerce').astype('Int64')
+    ensure_numeric(df, 'size_sqm', 'Int32')
     
     # Convert date strings to date type
-    df['opening_date'] = pd.to_datetime(df['opening_date'], errors='coerce')
+    ensure_datetime(df, 'opening_date')
     
     # Add derived columns
-    df['opening_year'] = df['opening_date'].dt.year
+    df['opening_year'] = df['opening_date'].dt.year.astype('Int16')
     
     print("Stores data cleaned and standardized")
     return df
@@ -103,26 +266,26 @@ def clean_stores_data(df):
 def clean_sales_data(df):
     """Clean and standardize sales data."""
     # Handle missing values
-    df['quantity'] = df['quantity'].fillna(1)
-    df['discount'] = df['discount'].fillna(0.0)
+    df.fillna({'quantity': 1, 'discount': 0.0}, inplace=True)
     
     # Convert data types
-    df['quantity'] = pd.to_numeric(df['quantity'], errors='coerce').astype('Int64')
-    df['unit_price'] = pd.to_numeric(df['unit_price'], errors='coerce')
-    df['discount'] = pd.to_numeric(df['discount'], errors='coerce')
-    df['final_price'] = pd.to_numeric(df['final_price'], errors='coerce')
-    df['total_amount'] = pd.to_numeric(df['total_amount'], errors='coerce')
+    ensure_numeric(df, 'quantity', 'Int16')
+    ensure_numeric(df, 'unit_price', 'float64')
+    ensure_numeric(df, 'discount', 'float64')
+    ensure_numeric(df, 'final_price', 'float64')
+    ensure_numeric(df, 'total_amount', 'float64')
     
     # Standardize text fields
-    df['payment_method'] = df['payment_method'].str.strip()
+    df['payment_method'] = map_categories(df['payment_method'], str.strip)
     
     # Convert date strings to date type
-    df['transaction_date'] = pd.to_datetime(df['transaction_date'], errors='coerce')
+    ensure_datetime(df, 'transaction_date')
     
     # Add derived columns
-    df['transaction_year'] = df['transaction_date'].dt.year
-    df['transaction_month'] = df['transaction_date'].dt.month
-    df['transaction_day'] = df['transaction_date'].dt.day
+    year, month, day = date_parts(df['transaction_date'])
+    df['transaction_year'] = pd.array(year, dtype='Int16')
+    df['transaction_month'] = pd.array(month, dtype='Int8')
+    df['transaction_day'] = pd.array(day, dtype='Int8')
     
     print("Sales data cleaned and standardized")
     return df
@@ -130,39 +293,98 @@ def clean_sales_data(df):
 def clean_performance_data(df):
     """Clean and standardize product performance data."""
     # Handle missing values
-    df['energy_consumption_kwh'] = df['energy_consumption_kwh'].fillna(0.0)
-    df['failure_rate'] = df['failure_rate'].fillna(0.0)
-    df['customer_satisfaction'] = df['customer_satisfaction'].fillna(3.0)
-    df['return_rate'] = df['return_rate'].fillna(0.0)
-    df['warranty_claims'] = df['warranty_claims'].fillna(0)
+    df.fillna({
+        'energy_consumption_kwh': 0.0, 'failure_rate': 0.0, 'customer_satisfaction': 3.0,
+        'return_rate': 0.0, 'warranty_claims': 0
+    }, inplace=True)
     
     # Convert data types
-    df['energy_consumption_kwh'] = pd.to_numeric(df['energy_consumption_kwh'], errors='coerce')
-    df['failure_rate'] = pd.to_numeric(df['failure_rate'], errors='coerce')
-    df['customer_satisfaction'] = pd.to_numeric(df['customer_satisfaction'], errors='coerce')
-    df['return_rate'] = pd.to_numeric(df['return_rate'], errors='coerce')
-    df['warranty_claims'] = pd.to_numeric(df['warranty_claims'], errors='coerce').astype('Int64')
-    
-    # Extract year and month from year_month field
-    df['year'] = df['year_month'].str[:4].astype(int)
-    df['month'] = df['year_month'].str[5:7].astype(int)
+    ensure_numeric(df, 'energy_consumption_kwh', 'float64')
+    ensure_numeric(df, 'failure_rate', 'float64')
+    ensure_numeric(df, 'customer_satisfaction', 'float64')
+    ensure_numeric(df, 'return_rate', 'float64')
+    ensure_numeric(df, 'warranty_claims', 'Int16')
+    
+    # Extract year and month from year_month field with one fixed-format
+    # parse; cache parses each distinct month only once
+    year_month = pd.to_datetime(df['year_month'], format='%Y-%m', cache=True).dt
+    df['year'] = year_month.year.astype('int16')
+    df['month'] = year_month.month.astype('int8')
     
     print("Performance data cleaned and standardized")
     return df
 
+def write_parquet(df, path):
+    """Write a dataframe to a zstd-compressed Parquet file."""
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), path, **PARQUET_WRITE_OPTIONS)
+
+def write_sales_blocks(input_path, output_path, convert_options):
+    """Clean the sales CSV block by block and write it to a Parquet file."""
+    writer = None
+    sample = None
+    n_records = 0
+    
+    # Sales is the largest table; streaming it from the memory-mapped file
+    # keeps only one block of raw and cleaned rows in memory instead of the
+    # whole table twice
+    with pa.memory_map(input_path, 'r') as source:
+        reader = pacsv.open_csv(source, read_options=CSV_READ_OPTIONS, convert_options=convert_options)
+        try:
+            for batch in reader:
+                if batch.num_rows == 0:
+                    continue
+                df = clean_sales_data(batch.to_pandas(split_blocks=True))
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                
+                # The first cleaned block fixes the file schema
+                if writer is None:
+                    writer = pq.ParquetWriter(output_path, table.schema, **PARQUET_WRITE_OPTIONS)
+                    sample = df.head(5)
+                writer.write_table(table)
+                n_records += len(df)
+        finally:
+            if writer is not None:
+                writer.close()
+    
+    return sample, n_records
+
+def process_sales_data(input_path, output_path):
+    """Clean the sales CSV block by block, appending each block to a Parquet file."""
+    # Create output directory if it doesn't exist
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    
+    # A malformed number or date can surface in any block, so the file is
+    # rewritten from the start with every column read as text, leaving the
+    # bad cells for clean_sales_data to coerce
+    column_types = RAW_COLUMN_TYPES['sales']
+    try:
+        sample, n_records = write_sales_blocks(
+            input_path, output_path, pacsv.ConvertOptions(column_types=column_types)
+        )
+    except pa.ArrowInvalid:
+        sample, n_records = write_sales_blocks(input_path, output_path, text_convert_options(column_types))
+    
+    print(f"Sales: {n_records} records processed to {output_path}")
+    return sample
+
 def save_processed_data(dfs, output_dir):
-    """Save processed dataframes to CSV files."""
-    products_df, customers_df, stores_df, sales_df, performance_df = dfs
+    """Save processed dataframes to Parquet files."""
+    products_df, customers_df, stores_df, performance_df = dfs
     
     # Create output directory if it doesn't exist
     os.makedirs(output_dir, exist_ok=True)
     
-    # Save dataframes to CSV files
-    products_df.to_csv(f"{output_dir}/products_processed.csv", index=False)
-    customers_df.to_csv(f"{output_dir}/customers_processed.csv", index=False)
-    stores_df.to_csv(f"{output_dir}/stores_processed.csv", index=False)
-    sales_df.to_csv(f"{output_dir}/sales_processed.csv", index=False)
-    performance_df.to_csv(f"{output_dir}/performance_processed.csv", index=False)
+    # Parquet keeps the cleaned column types, so the star schema step reads
+    # them back without re-parsing text; pyarrow releases the GIL while
+    # encoding and writing, so the files are written concurrently
+    outputs = [
+        (products_df, f"{output_dir}/products_processed.parquet"),
+        (customers_df, f"{output_dir}/customers_processed.parquet"),
+        (stores_df, f"{output_dir}/stores_processed.parquet"),
+        (performance_df, f"{output_dir}/performance_processed.parquet")
+    ]
+    with ThreadPoolExecutor(max_workers=len(outputs)) as executor:
+        list(executor.map(lambda output: write_parquet(*output), outputs))
     
     print(f"Processed data saved to {output_dir}")
 
@@ -175,27 +397,38 @@ def main():
     output_dir = "src/data/processed_data"
     
     # Load data
-    products_df, customers_df, stores_df, sales_df, performance_df = load_data(input_dir)
-    
-    # Clean and standardize data
-    products_df_clean = clean_products_data(products_df)
-    customers_df_clean = clean_customers_data(customers_df)
-    stores_df_clean = clean_stores_data(stores_df)
-    sales_df_clean = clean_sales_data(sales_df)
-    performance_df_clean = clean_performance_data(performance_df)
+    products_df, customers_df, stores_df, performance_df = load_data(input_dir)
+    
+    # Clean and standardize data; the tables are independent, so they are
+    # cleaned concurrently (threads rather than processes, since the heavy
+    # lifting runs in pandas/pyarrow kernels and frames need no pickling).
+    # Sales is read, cleaned and saved in one streaming pass
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        sales_future = executor.submit(
+            process_sales_data, f"{input_dir}/{RAW_FILES['sales']}", f"{output_dir}/sales_processed.parquet"
+        )
+        products_future = executor.submit(clean_products_data, products_df)
+        customers_future = executor.submit(clean_customers_data, customers_df)
+        stores_future = executor.submit(clean_stores_data, stores_df)
+        performance_future = executor.submit(clean_performance_data, performance_df)
+        products_df = products_future.result()
+        customers_df = customers_future.result()
+        stores_df = stores_future.result()
+        sales_sample = sales_future.result()
+        performance_df = performance_future.result()
     
     # Save processed data
     save_processed_data(
-        (products_df_clean, customers_df_clean, stores_df_clean, sales_df_clean, performance_df_clean),
+        (products_df, customers_df, stores_df, performance_df),
         output_dir
     )
     
     # Show sample of processed data
     print("\nSample of processed products data:")
-    print(products_df_clean.head(5))
+    print(products_df.head(5))
     
     print("\nSample of processed sales data:")
-    print(sales_df_clean.head(5))
+    print(sales_sample)
     
     print("Electric product data processing completed successfully!")
 
@@ -0,0 +1,142 @@
+"""Tests for the dashboard filter callbacks."""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src", "dashboard"))
+
+import app as dashboard
+
+
+def sample_data():
+    """Build small dashboard tables, including a sale with no year."""
+    categories = pd.CategoricalDtype(['APPLIANCES', 'LIGHTING'])
+    countries = pd.CategoricalDtype(['UK', 'USA'])
+    sales_data = pd.DataFrame({
+        'year': [2022.0, 2023.0, 2023.0, np.nan],
+        'month': [1.0, 2.0, 3.0, np.nan],
+        'category': pd.Series(['APPLIANCES', 'LIGHTING', 'APPLIANCES', 'LIGHTING'], dtype=categories),
+        'country': pd.Series(['UK', 'USA', 'USA', 'UK'], dtype=countries),
+        'total_amount': np.array([100.0, 200.0, 300.0, 400.0], dtype=np.float32),
+        'profit_margin': np.array([10.0, 20.0, 30.0, 40.0], dtype=np.float32)
+    })
+    performance_data = pd.DataFrame({
+        'year': np.array([2022, 2023, 2023], dtype=np.int16),
+        'category': pd.Series(['APPLIANCES', 'LIGHTING', 'APPLIANCES'], dtype=categories),
+        'subcategory': ['Ovens', 'LED Bulbs', 'Fans'],
+        'energy_consumption_kwh': np.array([100.0, 50.0, 75.0], dtype=np.float32),
+        'failure_rate': np.array([0.02, 0.03, 0.01], dtype=np.float32),
+        'customer_satisfaction': np.array([4.0, 3.5, 4.5], dtype=np.float32),
+        'return_rate': np.array([0.05, 0.04, 0.06], dtype=np.float32)
+    })
+    return sales_data, performance_data
+
+
+def find_component(component, component_id):
+    """Find a component's props by id in the layout JSON served to the browser."""
+    props = component.get('props', {})
+    if props.get('id') == component_id:
+        return props
+    children = props.get('children')
+    for child in children if isinstance(children, list) else [children]:
+        if isinstance(child, dict):
+            found = find_component(child, component_id)
+            if found is not None:
+                return found
+    return None
+
+
+def dependencies(client):
+    """Fetch the app's callbacks from Dash's HTTP endpoint, keyed by output."""
+    return {dependency['output']: dependency for dependency in client.get('/_dash-dependencies').get_json()}
+
+
+def post_selection(client, dependency, selection):
+    """Trigger one callback through Dash's HTTP endpoint."""
+    outputs = [
+        {'id': output.split('.')[0], 'property': output.split('.')[1]}
+        for output in dependency['output'].strip('.').split('...')
+    ]
+    payload = {
+        'output': dependency['output'],
+        'outputs': outputs if len(outputs) > 1 else outputs[0],
+        'inputs': [
+            {'id': i['id'], 'property': i['property'], 'value': selection[i['id']]}
+            for i in dependency['inputs']
+        ],
+        'changedPropIds': ['year-filter.value'],
+        'state': []
+    }
+    return client.post('/_dash-update-component', json=payload)
+
+
+def callback_response(client, output, selection):
+    """Run the callback writing the given output and return its decoded outputs."""
+    response = post_selection(client, dependencies(client)[output], selection)
+    assert response.status_code == 200, output
+    return response.get_json()['response']
+
+
+def test_year_options_exclude_missing_year():
+    app = dashboard.create_app(*sample_data())
+    layout = app.server.test_client().get('/_dash-layout').get_json()
+    year_filter = find_component(layout, 'year-filter')
+    assert year_filter['value'] == [2022.0, 2023.0]
+
+
+def test_filter_key_ignores_nulls():
+    assert dashboard.filter_key([2023.0, None, 2022.0, float('nan')]) == (2022.0, 2023.0)
+    assert dashboard.filter_key(None) == ()
+
+
+def test_callbacks_accept_null_year_selection():
+    app = dashboard.create_app(*sample_data())
+    client = app.server.test_client()
+    selection = {
+        'category-filter': ['APPLIANCES', 'LIGHTING'],
+        'country-filter': ['UK', 'USA'],
+        'year-filter': [2022.0, 2023.0, None]
+    }
+    for output, dependency in dependencies(client).items():
+        response = post_selection(client, dependency, selection)
+        assert response.status_code == 200, output
+    
+    # A null selects nothing, so only the dated sales are counted
+    selection = {
+        'category-filter': ['APPLIANCES'],
+        'country-filter': ['UK', 'USA'],
+        'year-filter': [2023.0, None]
+    }
+    response = callback_response(client, '..total-sales.children...avg-profit-margin.children..', selection)
+    assert response['total-sales']['children'] == "$300.00"
+
+
+def test_performance_categories_outside_sales_get_colors():
+    sales_data, performance_data = sample_data()
+    performance_categories = pd.CategoricalDtype(['APPLIANCES', 'HVAC', 'LIGHTING'])
+    performance_data['category'] = pd.Series(['HVAC', np.nan, 'APPLIANCES'], dtype=performance_categories)
+    client = dashboard.create_app(sales_data, performance_data).server.test_client()
+    selection = {'category-filter': ['APPLIANCES', 'HVAC'], 'year-filter': [2022.0, 2023.0]}
+    for chart in ['energy-satisfaction-chart', 'failure-rate-chart']:
+        figure = callback_response(client, f'{chart}.figure', selection)[chart]['figure']
+        assert [trace['name'] for trace in figure['data']] == ['APPLIANCES', 'HVAC']
+
+
+def test_shared_trend_resampler_is_opt_in(monkeypatch):
+    def shared_resampler(*args, **kwargs):
+        raise AssertionError("the shared resampler must not be created unless enabled")
+    
+    monkeypatch.setattr(dashboard, 'FigureResampler', shared_resampler)
+    monkeypatch.setattr(dashboard, 'RESAMPLE_TREND', False)
+    client = dashboard.create_app(*sample_data()).server.test_client()
+    selection = {
+        'category-filter': ['APPLIANCES'],
+        'country-filter': ['UK', 'USA'],
+        'year-filter': [2022.0, 2023.0]
+    }
+    # The trend is updated in place with a Patch rather than a resampled figure
+    figure = callback_response(client, 'sales-trend-chart.figure', selection)['sales-trend-chart']['figure']
+    assert '__dash_patch_update' in figure
@@ -0,0 +1,46 @@
+"""Tests for the CSV processing step."""
+
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src", "processing"))
+
+import pandas_data_processing as processing
+
+
+SALES_CSV = """transaction_id,product_id,customer_id,store_id,transaction_date,quantity,unit_price,discount,final_price,total_amount,payment_method
+T000001,P0001,C0001,S001,2022-04-10,4,100.0,0.1,90.0,360.0,Cash
+T000002,P0002,C0002,S002,2023-13-45,2,abc,0.0,50.0,100.0,Credit Card
+T000003,P0003,C0003,S003,2023-05-01,,20.0,,20.0,20.0,Cash
+"""
+
+STORES_CSV = """store_id,store_name,country,store_type,opening_date,size_sqm
+S001,North,UK,Retail,2020-01-01,500
+S002,South,USA,Outlet,2021-06-01,big
+S003,East,UK,Retail,2022-03-01,
+"""
+
+
+def test_malformed_store_cells_are_coerced(tmp_path):
+    path = tmp_path / "stores.csv"
+    path.write_text(STORES_CSV)
+    df = processing.clean_stores_data(processing.read_csv_typed(str(path), processing.RAW_COLUMN_TYPES['stores']))
+    # The malformed size is coerced; the empty one still gets its default
+    assert df['size_sqm'].tolist() == [500, pd.NA, 0]
+    assert df['opening_year'].tolist() == [2020, 2021, 2022]
+
+
+def test_malformed_sales_cells_are_coerced(tmp_path):
+    input_path = tmp_path / "sales.csv"
+    input_path.write_text(SALES_CSV)
+    output_path = tmp_path / "processed" / "sales_processed.parquet"
+    processing.process_sales_data(str(input_path), str(output_path))
+    df = pd.read_parquet(output_path)
+    assert df['unit_price'].isna().tolist() == [False, True, False]
+    assert df['transaction_date'].isna().tolist() == [False, True, False]
+    assert df['total_amount'].tolist() == [360.0, 100.0, 20.0]
+    # Empty cells still get their defaults once the text fallback has run
+    assert df['quantity'].tolist() == [4, 2, 1]
+    assert df['discount'].tolist() == [0.1, 0.0, 0.0]
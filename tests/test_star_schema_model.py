@@ -0,0 +1,73 @@
+"""Tests for the star schema build."""
+
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src", "processing"))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src", "models"))
+
+import pandas_data_processing as processing
+import star_schema_model as star_schema
+
+
+RAW_CSVS = {
+    'products.csv': """product_id,product_name,category,subcategory,energy_rating,price,manufacturing_cost,warranty_years,weight_kg,stock_quantity,launch_date
+P0001,Oven 1,Appliances,Ovens,A+,500.0,300.0,2,20.5,10,2022-01-15
+P0002,Bulb 2,Lighting,LED Bulbs,A++,10.0,4.0,1,0.1,500,2022-03-01
+""",
+    'customers.csv': """customer_id,customer_name,country,segment,acquisition_date,lifetime_value
+C0001,Customer 1,UK,Residential,2022-02-01,1000.0
+C0002,Customer 2,USA,Commercial,not a date,2000.0
+""",
+    'stores.csv': """store_id,store_name,country,store_type,opening_date,size_sqm
+S001,UK Store 1,UK,Retail,2020-01-01,500
+S002,USA Store 2,USA,Outlet,2021-06-01,big
+""",
+    'sales.csv': """transaction_id,product_id,customer_id,store_id,transaction_date,quantity,unit_price,discount,final_price,total_amount,payment_method
+T000001,P0001,C0001,S001,2022-04-10,2,500.0,0.0,500.0,1000.0,Cash
+T000003,P0001,C0001,S001,2023-02-30,1,500.0,0.0,500.0,500.0,Cash
+T000002,P0002,C0002,S002,2023-05-20,abc,10.0,0.0,10.0,30.0,Credit Card
+""",
+    'product_performance.csv': """product_id,year_month,energy_consumption_kwh,failure_rate,customer_satisfaction,return_rate,warranty_claims
+P0001,2022-01,100.0,0.01,4.0,0.02,1
+P0002,2022-01,5.0,0.02,4.5,0.01,abc
+"""
+}
+
+
+def run_pipeline(root):
+    """Process the raw CSVs under root and build the star schema from them."""
+    os.makedirs(root / "src" / "data" / "sample_data")
+    for name, text in RAW_CSVS.items():
+        (root / "src" / "data" / "sample_data" / name).write_text(text)
+    processing.main()
+    star_schema.main()
+    return root / "src" / "models" / "star_schema"
+
+
+def test_star_schema_accepts_coerced_missing_values(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    output_dir = run_pipeline(tmp_path)
+    
+    stores = pd.read_parquet(output_dir / "dim_store.parquet")
+    assert stores['size_sqm'].tolist() == [500, pd.NA]
+    customers = pd.read_parquet(output_dir / "dim_customer.parquet")
+    assert customers['acquisition_year'].tolist() == [2022, pd.NA]
+    assert customers['acquisition_month'].tolist() == [2, pd.NA]
+    
+    sales = pd.read_parquet(output_dir / "fact_sales.parquet")
+    assert sales['quantity'].tolist() == [2, 1, pd.NA]
+    assert sales['date_key'].tolist() == [20220410, pd.NA, 20230520]
+    # Amounts are summed into large totals, so they are not narrowed
+    assert sales['total_amount'].dtype == 'float64'
+    performance = pd.read_parquet(output_dir / "fact_performance.parquet")
+    assert performance['warranty_claims'].tolist() == [1, pd.NA]
+
+
+def test_unknown_ids_get_missing_keys():
+    dim = pd.DataFrame({'product_id': ['P0001', 'P0002']})
+    keys = star_schema.lookup_keys(pd.Series(['P0002', 'P9999', None, 'P0001']), dim, 'product_id')
+    assert keys.dtype == 'Int32'
+    assert keys.tolist() == [2, pd.NA, pd.NA, 1]